@@ -0,0 +1,169 @@
+#
+# Copyright (c) 2012-2020 MIRACL UK Ltd.
+#
+# This file is part of MIRACL Core
+# (see https://github.com/miracl/core).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as
+#    published by the Free Software Foundation, either version 3 of the
+#    License, or (at your option) any later version.
+
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+
+#     https://www.gnu.org/licenses/agpl-3.0.en.html
+
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+#   You can be released from the requirements of the license by purchasing
+#   a commercial license. Buying such a license is mandatory as soon as you
+#   develop commercial activities involving the MIRACL Core Crypto SDK
+#   without disclosing the source code of your own applications, or shipping
+#   the MIRACL Core Crypto SDK with a closed source product.
+
+#
+# benchmark driver for pairings and field reduction
+# Run config.py first and select ED25519, GOLDILOCKS, NIST521, BN254 and BLS12381
+#
+
+import time
+from constants import *
+
+import bn254.pair
+import bn254.fp12
+import bn254.fp12flat
+import bls12381.pair
+import bls12381.fp12
+import bls12381.fp12flat
+import bls12381.ecp
+import bls12381.ecp2
+import ed25519.ecp
+import goldilocks.ecp
+import nist521.ecp
+
+MIN_TIME = 1.0
+MIN_ITERS = 5
+
+
+def timing(label, f, iters=MIN_ITERS):
+    iterations = 0
+    start = time.process_time()
+    while True:
+        f()
+        iterations += 1
+        elapsed = time.process_time() - start
+        if elapsed >= MIN_TIME and iterations >= iters:
+            break
+    elapsed = 1000.0 * elapsed / iterations
+    print("%-24s- %8d iterations  %8.2f ms per iteration" %
+          (label, iterations, elapsed))
+
+
+def pairings(name, pkg):
+    print("\nTesting/Timing %s Pairings" % name)
+    curve = pkg.curve
+    G = pkg.ecp.generator()
+    Q = pkg.ecp2.generator()
+    s = (curve.r * 5) // 7
+
+    timing("G1 mul", lambda: s * G)
+    timing("G2 mul", lambda: s * Q)
+    timing("G1 mul (GLV)", lambda: pkg.pair.G1mul(G, s))
+    timing("G2 mul (GLS)", lambda: pkg.ecp2.gls_mul(Q, s))
+    timing("G2 mul (table)", lambda: pkg.ecp2.generator_mul(s))
+    timing("G2 hash", lambda: pkg.ecp2.hash_to_point("abc"))
+
+# time the Miller loop and final exponentiation with both Fp12 engines
+    for tower, F in (("objects", pkg.fp12.Fp12), ("flat", pkg.fp12flat.Fp12)):
+        pkg.pair.Fp12 = F
+        w = pkg.pair.ate(Q, G)
+        timing("PAIRing ATE (%s)" % tower, lambda: pkg.pair.ate(Q, G))
+        timing("PAIRing FEXP (%s)" % tower, lambda: pkg.pair.fexp(w.copy()))
+        g = pkg.pair.fexp(w.copy())
+        if not g.pow(curve.r).isone():
+            print("FAILURE - g^r!=1")
+
+
+def reduction(name, pkg, fold):
+    print("\nTesting/Timing %s Modular Reduction" % name)
+    curve = pkg.curve
+    big = pkg.big
+    p = curve.p
+    x = (p - 3) * (p - 5)
+    a = pkg.fp.Fp(p - 3)
+    b = pkg.fp.Fp(p - 5)
+    G = pkg.ecp.generator()
+    s = (curve.r * 5) // 7
+    fast = big.modreduce
+    if fast is fold:
+        print("special form reduction selected")
+    else:
+        print("generic reduction selected")
+
+# compare the special form reduction with generic %. Fp and the
+# point engines all reduce through big.modreduce
+    for form, f in (("generic", lambda y: y % p), ("special", fold)):
+        big.modreduce = f
+        if f(x) != x % p:
+            print("FAILURE - reduction")
+        timing("MOD reduce (%s)" % form, lambda: [f(x) for i in range(1000)])
+        timing("FP  mul x1000 (%s)" % form, lambda: [a * b for i in range(1000)])
+        timing("EC  mul (%s)" % form, lambda: s * G)
+    big.modreduce = fast
+
+
+def multimul(name, ecp, top):
+    print("\nTesting/Timing %s Multi-scalar Multiplication" % name)
+    curve = ecp.curve
+    G = ecp.generator()
+    P = [G.copy()]
+    for i in range(1, 1 << top):
+        Q = P[i - 1].copy()
+        Q.add(G)
+        P.append(Q)
+    E = [ecp.big.rand(curve.r) for i in range(0, 1 << top)]
+
+# compare with separate multiplications while that is still quick
+    for k in [1, 2] + list(range(4, top + 1, 2)):
+        n = 1 << k
+        if n <= 16:
+            R = ecp.multi_mul(P[0:n], E[0:n])
+            W = E[0] * P[0]
+            for i in range(1, n):
+                W.add(E[i] * P[i])
+            if R != W:
+                print("FAILURE - multi_mul")
+            timing("separate n=%d" % n, lambda: [E[i] * P[i] for i in range(0, n)])
+        timing("multi_mul n=%d" % n, lambda: ecp.multi_mul(P[0:n], E[0:n]), 1)
+
+
+reduction("ED25519", ed25519, ed25519.big.pmreduce)
+reduction("GOLDILOCKS", goldilocks, goldilocks.big.gmreduce)
+reduction("NIST521", nist521, nist521.big.pmreduce)
+pairings("BN254", bn254)
+pairings("BLS12381", bls12381)
+multimul("BLS12381 G1", bls12381.ecp, 16)
+multimul("BLS12381 G2", bls12381.ecp2, 10)
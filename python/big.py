@@ -50,9 +50,12 @@
 # M Scott August 2013
 #
 
+import os
 import math
 import types
-import random
+import hashlib
+import threading
+from constants import *
 
 from XXX import curve
 
@@ -102,6 +105,25 @@ def invmodp(a, p):
         a += kn
     return a
 
+# invert a list of elements mod prime p with a single inversion
+# (Montgomery's trick). Zero elements map to zero
+def invmodp_batch(L, p):
+    n = len(L)
+    c = [0] * n
+    acc = 1
+    for i in range(0, n):
+        c[i] = acc
+        if L[i] % p != 0:
+            acc = acc * L[i] % p
+    inv = invmodp(acc, p)
+    R = [0] * n
+    for i in range(n - 1, -1, -1):
+        if L[i] % p == 0:
+            continue
+        R[i] = inv * c[i] % p
+        inv = inv * L[i] % p
+    return R
+
 # Modular arithmetic
 def modmul(a1, b1, p):
     a = a1 % p
@@ -134,7 +156,98 @@ def moddiv(a, b, p):
         return modmul(a, i, p)
     return 0
 
-# modular square root. Fails spectacularly if p=1 mod 8
+# Reduction mod the field modulus by shift-and-add folding, for
+# special forms of modulus. Only curves whose modulus is large enough
+# for this to beat Python's own %, goldilocks, x448 and nist521, set
+# curve.MODTYPE. For 256 and 384 bit moduli % is as fast or faster
+MODBITS = curve.p.bit_length()
+MODMASK = (1 << MODBITS) - 1
+MConst = (1 << MODBITS) - curve.p
+
+# p=2^n-c
+def pmreduce(x):
+    p = curve.p
+    x = (x & MODMASK) + MConst * (x >> MODBITS)
+    x = (x & MODMASK) + MConst * (x >> MODBITS)
+    if x < 0 or x >= p:
+        return x % p
+    return x
+
+# p=2^n-2^(n/2)-1, Goldilocks
+def gmreduce(x):
+    p = curve.p
+    h = x >> MODBITS
+    x = (x & MODMASK) + h + (h << (MODBITS // 2))
+    h = x >> MODBITS
+    x = (x & MODMASK) + h + (h << (MODBITS // 2))
+    if x < 0 or x >= p:
+        return x % p
+    return x
+
+
+def modreduce(x):
+    return x % curve.p
+
+
+if hasattr(curve, 'MODTYPE'):
+    if curve.MODTYPE == PSEUDO_MERSENNE:
+        modreduce = pmreduce
+    if curve.MODTYPE == GENERALISED_MERSENNE:
+        modreduce = gmreduce
+
+# width-w NAF of e>0, least significant digit first.
+# Non-zero digits are odd, at most 2^(w-1)-1 in absolute value
+def wnaf(e, w):
+    D = []
+    m = 1 << w
+    while e > 0:
+        d = 0
+        if e & 1:
+            d = e & (m - 1)
+            if d >= m >> 1:
+                d -= m
+            e -= d
+        D.append(d)
+        e >>= 1
+    return D
+
+# window width for a scalar of nb bits
+def wnafw(nb):
+    if nb <= 64:
+        return 3
+    if nb <= 160:
+        return 4
+    if nb <= 576:
+        return 5
+    return 6
+
+# k signed digits of e>=0 in base 2^c, least significant first,
+# each in the range -2^(c-1)..2^(c-1)
+def sdigits(e, c, k):
+    D = []
+    m = 1 << c
+    for i in range(0, k):
+        d = e & (m - 1)
+        e >>= c
+        if d > m >> 1:
+            d -= m
+            e += 1
+        D.append(d)
+    return D
+
+# Pippenger window for n scalars of nb bits, minimising the
+# (nb/c).(n+2^c) additions of the bucket method
+def pippw(n, nb):
+    best = 2
+    cost = None
+    for c in range(2, 17):
+        t = ((nb + c) // c) * (n + (1 << c))
+        if cost is None or t < cost:
+            best = c
+            cost = t
+    return best
+
+# modular square root
 def sqrtmodp(a, p):
     if p % 4 == 3:
         return pow(a, (p + 1) // 4, p)
@@ -150,7 +263,33 @@ def sqrtmodp(a, p):
         r = modmul(r, i, p)
         return r
 
-    return 0
+    return tsqrtmodp(a, p)
+
+# Tonelli-Shanks for p=1 mod 8. With p-1=2^e.q, b=a^q is a 2^e-th root of
+# unity, and its discrete log base g=z^q is found w bits at a time by
+# table lookup. One exponentiation plus about e^2/2w squarings
+
+
+def tsqrtmodp(a, p):
+    a %= p
+    if a == 0:
+        return 0
+    if p not in TSTAB:
+        TSTAB[p] = tstables(p)
+    e, q, w, IG, T = TSTAB[p]
+    v = pow(a, (q - 1) // 2, p)
+    x = modmul(a, v, p)
+    t = modmul(x, v, p)
+    k = 0
+    i = 0
+    while i < e:
+        c = min(w, e - i)
+        d = T[pow(t, 1 << (e - i - c), p)] >> (w - c)
+        if d != 0:
+            t = modmul(t, pow(IG[i], d, p), p)
+            k += d << i
+        i += c
+    return modmul(x, pow(IG[0], k >> 1, p), p)
 
 
 # chinese remainder theorem
@@ -188,6 +327,116 @@ def jacobi(a, p):
     else:
         return -1
 
-# random number < m
-def rand(m):
-    return random.SystemRandom().randint(2, m - 1)
+# Tonelli-Shanks tables: e, q, window size, IG[i]=g^-(2^i) and
+# discrete logs of the 2^w-th roots of unity
+TSWIN = 8
+
+
+def tstables(p):
+    e = 0
+    q = p - 1
+    while q % 2 == 0:
+        q //= 2
+        e += 1
+    z = 2
+    while jacobi(z, p) != -1:
+        z += 1
+    g = pow(z, q, p)
+    w = min(e, TSWIN)
+    IG = [invmodp(g, p)]
+    for i in range(1, e):
+        IG.append(modmul(IG[i - 1], IG[i - 1], p))
+    h = pow(g, 1 << (e - w), p)
+    T = {}
+    y = 1
+    for j in range(0, 1 << w):
+        T[y] = j
+        y = modmul(y, h, p)
+    return (e, q, w, IG, T)
+
+# computed once for the field modulus
+TSTAB = {}
+if curve.p % 8 == 1:
+    TSTAB[curve.p] = tstables(curve.p)
+
+# Buffered random number generator. A hash DRBG, SHA512 of a secret
+# key and a counter, fills a large pool at a time. The key is replaced
+# after every refill and fresh OS entropy is mixed in every RESEED
+# refills. Given a seed it is deterministic, for tests and benchmarks.
+# A lock makes it safe to share between threads
+POOL = 4096
+RESEED = 64
+
+
+class RNG:
+    __slots__ = ('key', 'counter', 'pool', 'ptr', 'fixed', 'lock')
+
+    def __init__(self, S=None):
+        self.fixed = S is not None
+        if S is None:
+            S = os.urandom(64)
+        if isinstance(S, int):
+            S = to_bytes(S)
+        if isinstance(S, str):
+            S = S.encode()
+        self.key = hashlib.sha512(b'seed' + bytes(S)).digest()
+        self.counter = 0
+        self.pool = b''
+        self.ptr = 0
+        self.lock = threading.Lock()
+
+# call with the lock held
+    def refill(self):
+        if not self.fixed and self.counter % RESEED == 0:
+            self.key = hashlib.sha512(self.key + os.urandom(64)).digest()
+        self.counter += 1
+        c = self.counter.to_bytes(8, byteorder='big')
+        self.pool = b''.join([hashlib.sha512(self.key + c + i.to_bytes(4, byteorder='big')).digest()
+                              for i in range(0, POOL // 64)])
+        self.key = hashlib.sha512(self.key + c + b'next').digest()
+        self.ptr = 0
+
+    def rand_bytes(self, n):
+        with self.lock:
+            k = self.ptr + n
+            if k <= len(self.pool):
+                B = self.pool[self.ptr:k]
+                self.ptr = k
+                return B
+            B = bytearray()
+            while len(B) < n:
+                if self.ptr == len(self.pool):
+                    self.refill()
+                k = min(n - len(B), len(self.pool) - self.ptr)
+                B += self.pool[self.ptr:self.ptr + k]
+                self.ptr += k
+            return B
+
+# random number in [2,m-1], 64 extra bits make any bias negligible
+    def rand(self, m):
+        n = (m.bit_length() + 71) // 8
+        return 2 + int.from_bytes(self.rand_bytes(n), byteorder='big') % (m - 2)
+
+# n random numbers in [2,m-1], default modulus the group order
+    def rand_scalars(self, n, m=curve.r):
+        return [self.rand(m) for i in range(0, n)]
+
+
+# shared generator, re-seeded in a forked child
+RNGDEFAULT = RNG()
+
+
+def reseed_default():
+    global RNGDEFAULT
+    RNGDEFAULT = RNG()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reseed_default)
+
+
+# random number in [2,m-1], from the shared generator by default
+def rand(m, rng=None):
+    if rng is None:
+        rng = RNGDEFAULT
+    return rng.rand(m)
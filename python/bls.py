@@ -57,6 +57,7 @@ from XXX import big
 from XXX.ecp import *
 from XXX.ecp2 import *
 from XXX import pair
+from XXX import native
 from XXX.fp12 import *
 
 # hash message m to curve point
@@ -88,10 +89,9 @@ def BLS_H(m):
 # generate key pair, private key SK, public key PK
 
 
-def KeyPairGenerate():
-    G = ecp2.generator()
-    s = big.rand(curve.r)
-    W = s * G
+def KeyPairGenerate(rng=None):
+    s = big.rand(curve.r, rng)
+    W = ecp2.generator_mul(s)
     SK = big.to_bytes(s)
     PK = W.toBytes(True)    #set to True to compress public key
     return (SK, PK)
@@ -103,7 +103,7 @@ def KeyPairGenerate():
 def sign(m, SK):
     HM = BLS_H(m)
     s = big.from_bytes(SK)
-    D = s * HM
+    D = pair.G1mul(HM, s)
     return D.toBytes(True)
 
 
@@ -116,19 +116,22 @@ def verify(SIG, m, W):
     D.fromBytes(SIG)
     if D.isinf() :
         return False
-    if not (curve.r*D).isinf() :
+    if not D.in_subgroup():
         return False
     D = -D
 
-    PK = ECp2()
-    PK.fromBytes(W)
-
+    PK = ecp2.from_bytes_member(W)
+    if PK is None or PK.isinf():
+        return False
 
-    # Use new multi-pairing mechanism
-    r = pair.initmp()
-    pair.another_pc(r, G2_TAB, D)
-    pair.another(r, PK, HM)
-    v = pair.miller(r)
+    if native.active():
+        v = pair.double_ate(ecp2.generator(), D, PK, HM)
+    else:
+        # Use new multi-pairing mechanism
+        r = pair.initmp()
+        pair.another_pc(r, G2_TAB, D)
+        pair.another(r, PK, HM)
+        v = pair.miller(r)
 
     #.. or alternatively
     #    G=ecp2.generator()
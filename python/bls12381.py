@@ -53,11 +53,13 @@ SHA = 'sha256'   # hash type to use with this curve
 EFS = 48   # Elliptic curve Field Size in bytes
 CurveType = WEIERSTRASS
 CurveCof = 0xd201000000010001
+Coords = JACOBIAN    # point engine, PROJECTIVE or JACOBIAN (A=0 or -3)
 
 SexticTwist = M_TYPE
 SignOfX = NEGATIVEX
 PairingFriendly = BLS
 QNRI = 0
+Tower = FLAT       # Fp12 engine, OBJECTS (fp12.py) or FLAT (fp12flat.py)
 
 x = 0xd201000000010000
 
@@ -78,10 +80,52 @@ B = 4
 Gx = 0x17F1D3A73197D7942695638C4FA9AC0FC3688C4F9774B905A14E3A3F171BAC586C55E83FF97A1AEFFB3AF00ADB22C6BB
 Gy = 0x8B3F481E3AAA0F1A09E30ED741D8AE4FCF5E095D5D00AF600DB18CB2C04B3EDD03CC744A2888AE40CAA232946C5E7E1
 
+# GLV endomorphism (x,y) -> (Cru.x,y) = Lam.(x,y), and a reduced basis
+# [[a1, b1], [a2, b2]] of the lattice of (k1,k2) with k1+k2.Lam = 0 mod r,
+# ordered so that a1.b2-a2.b1 = r
+Cru = 0x1A0111EA397FE699EC02408663D4DE85AA0D857D89759AD4897D29650FB85F9B409427EB4F49FFFD8BFD00000000AAAC
+Lam = 0xAC45A4010001A40200000000FFFFFFFF
+Glv = [[0xAC45A4010001A40200000000FFFFFFFF, -0x1],
+       [0x1, 0xAC45A4010001A4020000000100000000]]
+
+# GLS endomorphism psi (the Frobenius on G2) acts on G2 as multiplication by
+# p mod r. A reduced basis of the lattice of (k0,k1,k2,k3) with
+# k0+k1.psi+k2.psi^2+k3.psi^3 = 0 mod r, and Glsw with Glsw.Gls = (r,0,0,0)
+Gls = [[-0xD201000000010000, -0x1, 0x0, 0x0],
+       [0x0, 0xD201000000010000, 0x1, 0x0],
+       [0x0, 0x0, 0xD201000000010000, 0x1],
+       [0x1, 0x0, -0x1, -0xD201000000010000]]
+Glsw = [-0x8D51CCCE760304D0EC0300027602FFFF2DFFFFFFFFFF0000,
+        -0xAC45A4010001A40200000000FFFFFFFF,
+        0xD201000000010000,
+        0x1]
+
 # Frobenius constant
 Fra = 0x1904D3BF02BB0667C231BEB4202C0D1F0FD603FD3CBD5F4F7B2443D784BAB9C4F67EA53D63E7813D8D0775ED92235FB8
 Frb = 0xFC3E2B36C4E03288E9E902231F9FB854A14787B6C7B36FEC0C8EC971F63C5F282D5AC14D6C7EC22CF78A126DDC4AF3
 
+# hash to G2 by simplified SWU on the 3-isogenous curve y^2=x^3+IsoA.x+IsoB
+# with parameter IsoZ, then the isogeny map (x,y) -> (XN/XD, y.YN/YD) of RFC
+# 9380. Elements of Fp2 are [a, b] = a+b.i, polynomials lowest degree first
+IsoA = [0x0, 0xF0]
+IsoB = [0x3F4, 0x3F4]
+IsoZ = [-0x2, -0x1]
+IsoXN = [[0x5C759507E8E333EBB5B7A9A47D7ED8532C52D39FD3A042A88B58423C50AE15D5C2638E343D9C71C6238AAAAAAAA97D6, 0x5C759507E8E333EBB5B7A9A47D7ED8532C52D39FD3A042A88B58423C50AE15D5C2638E343D9C71C6238AAAAAAAA97D6],
+         [0x0, 0x11560BF17BAA99BC32126FCED787C88F984F87ADF7AE0C7F9A208C6B4F20A4181472AAA9CB8D555526A9FFFFFFFFC71A],
+         [0x11560BF17BAA99BC32126FCED787C88F984F87ADF7AE0C7F9A208C6B4F20A4181472AAA9CB8D555526A9FFFFFFFFC71E, 0x8AB05F8BDD54CDE190937E76BC3E447CC27C3D6FBD7063FCD104635A790520C0A395554E5C6AAAA9354FFFFFFFFE38D],
+         [0x171D6541FA38CCFAED6DEA691F5FB614CB14B4E7F4E810AA22D6108F142B85757098E38D0F671C7188E2AAAAAAAA5ED1, 0x0]]
+IsoXD = [[0x0, 0x1A0111EA397FE69A4B1BA7B6434BACD764774B84F38512BF6730D2A0F6B0F6241EABFFFEB153FFFFB9FEFFFFFFFFAA63],
+         [0xC, 0x1A0111EA397FE69A4B1BA7B6434BACD764774B84F38512BF6730D2A0F6B0F6241EABFFFEB153FFFFB9FEFFFFFFFFAA9F],
+         [0x1, 0x0]]
+IsoYN = [[0x1530477C7AB4113B59A4C18B076D11930F7DA5D4A07F649BF54439D87D27E500FC8C25EBF8C92F6812CFC71C71C6D706, 0x1530477C7AB4113B59A4C18B076D11930F7DA5D4A07F649BF54439D87D27E500FC8C25EBF8C92F6812CFC71C71C6D706],
+         [0x0, 0x5C759507E8E333EBB5B7A9A47D7ED8532C52D39FD3A042A88B58423C50AE15D5C2638E343D9C71C6238AAAAAAAA97BE],
+         [0x11560BF17BAA99BC32126FCED787C88F984F87ADF7AE0C7F9A208C6B4F20A4181472AAA9CB8D555526A9FFFFFFFFC71C, 0x8AB05F8BDD54CDE190937E76BC3E447CC27C3D6FBD7063FCD104635A790520C0A395554E5C6AAAA9354FFFFFFFFE38F],
+         [0x124C9AD43B6CF79BFBF7043DE3811AD0761B0F37A1E26286B0E977C69AA274524E79097A56DC4BD9E1B371C71C718B10, 0x0]]
+IsoYD = [[0x1A0111EA397FE69A4B1BA7B6434BACD764774B84F38512BF6730D2A0F6B0F6241EABFFFEB153FFFFB9FEFFFFFFFFA8FB, 0x1A0111EA397FE69A4B1BA7B6434BACD764774B84F38512BF6730D2A0F6B0F6241EABFFFEB153FFFFB9FEFFFFFFFFA8FB],
+         [0x0, 0x1A0111EA397FE69A4B1BA7B6434BACD764774B84F38512BF6730D2A0F6B0F6241EABFFFEB153FFFFB9FEFFFFFFFFA9D3],
+         [0x12, 0x1A0111EA397FE69A4B1BA7B6434BACD764774B84F38512BF6730D2A0F6B0F6241EABFFFEB153FFFFB9FEFFFFFFFFAA99],
+         [0x1, 0x0]]
+
 # Generator point on G2
 Pxa = 0x24AA2B2F08F0A91260805272DC51051C6E47AD4FA403B02B4510B647AE3D1770BAC0326A805BBEFD48056C8C121BDB8
 Pxb = 0x13E02B6052719F607DACD3A088274F65596BD0D09920B61AB5DA61BBDC7F5049334CF11213945D57E5AC7D055D042B7E
@@ -24,11 +24,13 @@ SHA = 'sha256'   # hash type to use with this curve
 EFS = 48   # Elliptic curve Field Size in bytes
 CurveType = WEIERSTRASS
 CurveCof = 0x100080000010011FF
+Coords = JACOBIAN    # point engine, PROJECTIVE or JACOBIAN (A=0 or -3)
 
 SexticTwist = M_TYPE
 SignOfX = POSITIVEX
 PairingFriendly = BLS
 QNRI = 0
+Tower = FLAT       # Fp12 engine, OBJECTS (fp12.py) or FLAT (fp12flat.py)
 
 x = 0x10008000001001200
 
@@ -49,6 +51,26 @@ B = 15
 Gx = 0x41FCBA55B979ECE4E3835F4052DDB050F31D9F76B081F42C2F87BAD84AF1E3445C55DBF083F4770478C4773908734573
 Gy = 0x68F167274CFB300024AE9CDC31C46D99D0DADC66BB6449107530A94ADEB4D2DDE57D49EC87F98FD212D165E8003F224
 
+# GLV endomorphism (x,y) -> (Cru.x,y) = Lam.(x,y), and a reduced basis
+# [[a1, b1], [a2, b2]] of the lattice of (k1,k2) with k1+k2.Lam = 0 mod r,
+# ordered so that a1.b2-a2.b1 = r
+Cru = 0x5565569564AB6EB4A045AB4406E9487460544534DBDD715CE2522F4A34DEA341BC25F681A2DF65D2DCC367502EAAC2A9
+Lam = 0x1002001800C00B809C04401C81698B380DDF5F0559F209F961B1F99C7FD780001
+Glv = [[0x1, -0x10010004002003401200100240143FFFF],
+       [0x100100040020034012001002401440000, 0x1]]
+
+# GLS endomorphism psi (the Frobenius on G2) acts on G2 as multiplication by
+# p mod r. A reduced basis of the lattice of (k0,k1,k2,k3) with
+# k0+k1.psi+k2.psi^2+k3.psi^3 = 0 mod r, and Glsw with Glsw.Gls = (r,0,0,0)
+Gls = [[0x10008000001001200, -0x1, 0x0, 0x0],
+       [0x0, -0x10008000001001200, 0x1, 0x0],
+       [0x0, 0x0, -0x10008000001001200, 0x1],
+       [0x1, 0x0, -0x1, 0x10008000001001200]]
+Glsw = [0x1001800C00500660420108084072C1F5F35FBCC16C6FFEE00,
+        -0x10010004002003401200100240143FFFF,
+        -0x10008000001001200,
+        0x1]
+
 # Frobenius constant
 Fra = 0x22ACD5BF027F68BC338B9FC2C11B52F10E4C6CD23FBA1A868256744AE550D8C8A3693480FE6773E01852D72D3311DAC1
 Frb = 0x32B880D6622C05F96CE20E015ECF3F939260D95AB3AB8A8B29DB43B684104C2BD7230AA88BFD114BC1E446375298D5EA
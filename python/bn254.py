@@ -24,11 +24,13 @@ SHA = 'sha256'   # hash type to use with this curve
 EFS = 32   # Elliptic curve Field Size in bytes
 CurveType = WEIERSTRASS
 CurveCof = 1
+Coords = JACOBIAN    # point engine, PROJECTIVE or JACOBIAN (A=0 or -3)
 
 SexticTwist = D_TYPE
 SignOfX = NEGATIVEX
 PairingFriendly = BN
 QNRI = 0
+Tower = FLAT       # Fp12 engine, OBJECTS (fp12.py) or FLAT (fp12flat.py)
 
 x = 0x4080000000000001
 if SignOfX == NEGATIVEX:
@@ -47,6 +49,26 @@ B = 2
 Gx = p - 1
 Gy = 1
 
+# GLV endomorphism (x,y) -> (Cru.x,y) = Lam.(x,y), and a reduced basis
+# [[a1, b1], [a2, b2]] of the lattice of (k1,k2) with k1+k2.Lam = 0 mod r,
+# ordered so that a1.b2-a2.b1 = r
+Cru = 0x25236482400000017080EB4000000006181800000000000CD98000000000000B
+Lam = 0x252364824000000126CD8900000000024908FFFFFFFFFFFCF9FFFFFFFFFFFFF6
+Glv = [[0x61818000000000020400000000000003, -0x8100000000000001],
+       [0x8100000000000001, 0x61818000000000028500000000000004]]
+
+# GLS endomorphism psi (the Frobenius on G2) acts on G2 as multiplication by
+# p mod r. A reduced basis of the lattice of (k0,k1,k2,k3) with
+# k0+k1.psi+k2.psi^2+k3.psi^3 = 0 mod r, and Glsw with Glsw.Gls = (r,0,0,0)
+Gls = [[0x8100000000000001, 0x0, 0x8100000000000002, -0x1],
+       [0x8100000000000001, -0x4080000000000001, -0x4080000000000000, -0x4080000000000001],
+       [-0x4080000000000001, 0x4080000000000001, -0x4080000000000001, -0x8100000000000001],
+       [0x8100000000000002, 0x4080000000000000, -0x4080000000000001, 0x4080000000000001]]
+Glsw = [0x189120C000000000C3030000000000028500000000000003,
+        0x189120C000000000C303000000000001C380000000000001,
+        0x8100000000000001,
+        0x189120C00000000124848000000000044880000000000005]
+
 # Frobenius constant
 Fra = 0x1B377619212E7C8CB6499B50A846953F850974924D3F77C2E17DE6C06F2A6DE9
 Frb = 0x9EBEE691ED1837503EAB22F57B96AC8DC178B6DB2C08850C582193F90D5922A
@@ -24,11 +24,13 @@ SHA = 'sha256'   # hash type to use with this curve
 EFS = 32   # Elliptic curve Field Size in bytes
 CurveType = WEIERSTRASS
 CurveCof = 1
+Coords = JACOBIAN    # point engine, PROJECTIVE or JACOBIAN (A=0 or -3)
 
 SexticTwist = D_TYPE
 SignOfX = NEGATIVEX
 PairingFriendly = BN
 QNRI = 0
+Tower = FLAT       # Fp12 engine, OBJECTS (fp12.py) or FLAT (fp12flat.py)
 
 x = 0x4000000003C012B1
 if SignOfX == NEGATIVEX:
@@ -47,6 +49,26 @@ B = 2
 Gx = p - 1
 Gy = 1
 
+# GLV endomorphism (x,y) -> (Cru.x,y) = Lam.(x,y), and a reduced basis
+# [[a1, b1], [a2, b2]] of the lattice of (k1,k2) with k1+k2.Lam = 0 mod r,
+# ordered so that a1.b2-a2.b1 = r
+Cru = 0x2400000008702A0D68BDDF646DBB27BEE381F789A619B78B8C8590D7C7F7F91B
+Lam = 0x2400000008702A0D20BDDF646112E8A922C4182507294FEC5953709BCC14A3B6
+Glv = [[0x600000000B40381200546349162FEB83, -0x8000000007802561],
+       [0x8000000007802561, 0x600000000B403812805463491DB010E4]]
+
+# GLS endomorphism psi (the Frobenius on G2) acts on G2 as multiplication by
+# p mod r. A reduced basis of the lattice of (k0,k1,k2,k3) with
+# k0+k1.psi+k2.psi^2+k3.psi^3 = 0 mod r, and Glsw with Glsw.Gls = (r,0,0,0)
+Gls = [[0x8000000007802561, 0x0, 0x8000000007802562, -0x1],
+       [0x8000000007802561, -0x4000000003C012B1, -0x4000000003C012B0, -0x4000000003C012B1],
+       [-0x4000000003C012B1, 0x4000000003C012B1, -0x4000000003C012B1, -0x8000000007802561],
+       [0x8000000007802562, 0x4000000003C012B0, -0x4000000003C012B1, 0x4000000003C012B1]]
+Glsw = [0x1800000004381506C03F4A76D0A52D1CFB4ADBB28A7686E3,
+        0x1800000004381506C03F4A76D0A52D1C3B4ADBB27F364ED1,
+        0x8000000007802561,
+        0x1800000004381507203F4A76DBE5652EBB9F3EFB9CE65FB5]
+
 # Frobenius constant
 Fra = 0x1359082FA63A0164AFE18B8AACA7189868677326F173F8215BD9083355C80EA3
 Frb = 0x10A6F7D0623628A900DC53D9CDBC4E3ABBD863C7269546C0628D1BBC06534710
@@ -24,11 +24,13 @@ SHA = 'sha256'   # hash type to use with this curve
 EFS = 58   # Elliptic curve Field Size in bytes
 CurveType = WEIERSTRASS
 CurveCof = 1
+Coords = JACOBIAN    # point engine, PROJECTIVE or JACOBIAN (A=0 or -3)
 
 SexticTwist = D_TYPE
 SignOfX = POSITIVEX
 PairingFriendly = BN
 QNRI = 1
+Tower = FLAT       # Fp12 engine, OBJECTS (fp12.py) or FLAT (fp12flat.py)
 
 x = 0x4001FFFFFFFFFFFFFFFFFFFFFBFFF
 
@@ -48,6 +50,26 @@ B = 5
 Gx = 0x21a6d67ef250191fadba34a0a30160b9ac9264b6f95f63b3edbec3cf4b2e689db1bbb4e69a416a0b1e79239c0372e5cd70113c98d91f36b6980d
 Gy = 0x0118ea0460f7f7abb82b33676a7432a490eeda842cccfa7d788c659650426e6af77df11b8ae40eb80f475432c66600622ecaa8a5734d36fb03de
 
+# GLV endomorphism (x,y) -> (Cru.x,y) = Lam.(x,y), and a reduced basis
+# [[a1, b1], [a2, b2]] of the lattice of (k1,k2) with k1+k2.Lam = 0 mod r,
+# ordered so that a1.b2-a2.b1 = r
+Cru = 0x4806C036008FFFFFFFFFFFFFF27F03FA5FF700000000000000D80B402AC035FFFFFFFFFFFFFB7FDBFF93FF8
+Lam = 0x900D806C011FFFFFFFFFFFFFE4FDF5F39FE980000000000001B018C06D809BFFFFFFFFFFFFF6FFA5FEC7FE9
+Glv = [[0x8003FFFFFFFFFFFFFFFFFFFFF7FFF, -0x60060017FFFFFFFFFFFFFFFFF3FF77FEC0000000000000000060028004],
+       [0x60060017FFFFFFFFFFFFFFFFF3FF7FFF00000000000000000060020003, 0x8003FFFFFFFFFFFFFFFFFFFFF7FFF]]
+
+# GLS endomorphism psi (the Frobenius on G2) acts on G2 as multiplication by
+# p mod r. A reduced basis of the lattice of (k0,k1,k2,k3) with
+# k0+k1.psi+k2.psi^2+k3.psi^3 = 0 mod r, and Glsw with Glsw.Gls = (r,0,0,0)
+Gls = [[-0x8003FFFFFFFFFFFFFFFFFFFFF7FFF, 0x0, -0x8003FFFFFFFFFFFFFFFFFFFFF7FFE, -0x1],
+       [0x8003FFFFFFFFFFFFFFFFFFFFF7FFE, 0x4001FFFFFFFFFFFFFFFFFFFFFC000, -0x4001FFFFFFFFFFFFFFFFFFFFFBFFF, 0x4001FFFFFFFFFFFFFFFFFFFFFBFFF],
+       [0x4001FFFFFFFFFFFFFFFFFFFFFC000, 0x4001FFFFFFFFFFFFFFFFFFFFFBFFF, 0x4001FFFFFFFFFFFFFFFFFFFFFBFFF, -0x8003FFFFFFFFFFFFFFFFFFFFF7FFE],
+       [0x8003FFFFFFFFFFFFFFFFFFFFF7FFF, -0x4001FFFFFFFFFFFFFFFFFFFFFBFFF, -0x4001FFFFFFFFFFFFFFFFFFFFFC000, -0x4001FFFFFFFFFFFFFFFFFFFFFBFFF]]
+Glsw = [-0x18024012002FFFFFFFFFFFFFFB7FABFE1FFD000000000000004803C00E000FFFFFFFFFFFFFFE7FF3FFDFFFE,
+        0x18024012002FFFFFFFFFFFFFFB7FA5FDBFFB80000000000000480480164021FFFFFFFFFFFFFE7FEDFFBBFFB,
+        0x8003FFFFFFFFFFFFFFFFFFFFF7FFF,
+        0x18024012002FFFFFFFFFFFFFFB7FABFE1FFD000000000000004803C00DC00DFFFFFFFFFFFFFE7FF3FFE3FFF]
+
 # Frobenius constant
 Fra = 0x16FF4348CBB40BCFDB5A8CC1172708592ED03A9A87E11C792504D547C0562173310CC78D90D45D1D93FA1180FC7D89659DBDEE4BE3FF2575D1A
 Frb = 0x23C37F80940E90EA882008E6B68325B27493CA001E85F7B00D8E4B1DBADB14A1A7A84FF0D00F94F4BD630A20902388657BEB62204AE0955FF85B
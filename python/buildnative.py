@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2012-2020 MIRACL UK Ltd.
+#
+# This file is part of MIRACL Core
+# (see https://github.com/miracl/core).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as
+#    published by the Free Software Foundation, either version 3 of the
+#    License, or (at your option) any later version.
+
+
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+
+#     https://www.gnu.org/licenses/agpl-3.0.en.html
+
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+#   You can be released from the requirements of the license by purchasing     
+#   a commercial license. Buying such a license is mandatory as soon as you
+#   develop commercial activities involving the MIRACL Core Crypto SDK
+#   without disclosing the source code of your own applications, or shipping
+#   the MIRACL Core Crypto SDK with a closed source product.     
+
+
+#
+# Build the shared library libcore.so, used by the optional native
+# backend (native.py), from the C code in ../c
+# Needs gcc and a Unix-like system. Run as
+#
+#   python3 buildnative.py [path to c directory]
+#
+
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+
+# config64.py choices of the curves supported here
+# ED25519, C25519, NIST256, GOLDILOCKS, NIST384, NIST521, SECP256K1,
+# X448, BN254, BN254CX, BLS12383, BLS12381 and BN462
+choices = [1, 2, 3, 7, 8, 10, 17, 21, 26, 27, 28, 29, 33]
+
+here = os.path.dirname(os.path.abspath(__file__))
+cdir = os.path.join(here, "..", "c")
+if len(sys.argv) == 2:
+    cdir = sys.argv[1]
+
+work = tempfile.mkdtemp()
+for name in os.listdir(cdir):
+    if name.endswith(".c") or name.endswith(".h") or name == "config64.py":
+        shutil.copy(os.path.join(cdir, name), work)
+
+# compile position independent code, so it can go in a shared library
+config = os.path.join(work, "config64.py")
+f = open(config, 'r')
+script = f.read()
+f.close()
+f = open(config, 'w')
+f.write(script.replace("gcc -O3 -std=c99 -c", "gcc -O3 -std=c99 -fPIC -c"))
+f.close()
+
+print("Building C library, this takes a few minutes")
+answers = "".join(["%d\n" % x for x in choices]) + "0\n"
+subprocess.run([sys.executable, "config64.py"], input=answers.encode(),
+               cwd=work, stdout=subprocess.DEVNULL, check=True)
+subprocess.run(["gcc", "-shared", "-o", "libcore.so", "-Wl,--whole-archive",
+                "core.a", "-Wl,--no-whole-archive"], cwd=work, check=True)
+shutil.copy(os.path.join(work, "libcore.so"), here)
+shutil.rmtree(work)
+print("libcore.so created")
@@ -72,12 +72,14 @@ def curveset(tc, pf):
     os.system(copytext + "fp.py " + fpath + "fp.py")
     os.system(copytext + "ecp.py " + fpath + "ecp.py")
     os.system(copytext + "ecdh.py " + fpath + "ecdh.py")
+    os.system(copytext + "native.py " + fpath + "native.py")
     os.system(copytext + tc + ".py " + fpath + "curve.py")
 
     replace(fpath + "big.py", "XXX", tc)
     replace(fpath + "fp.py", "XXX", tc)
     replace(fpath + "ecp.py", "XXX", tc)
     replace(fpath + "ecdh.py", "XXX", tc)
+    replace(fpath + "native.py", "XXX", tc)
 
     if pf != "NOT":
         os.system(copytext + "fp2.py " + fpath + "fp2.py")
@@ -88,11 +90,13 @@ def curveset(tc, pf):
 
         os.system(copytext + "ecp2.py " + fpath + "ecp2.py")
         os.system(copytext + "fp12.py " + fpath + "fp12.py")
+        os.system(copytext + "fp12flat.py " + fpath + "fp12flat.py")
         os.system(copytext + "pair.py " + fpath + "pair.py")
         os.system(copytext + "mpin.py " + fpath + "mpin.py")
         os.system(copytext + "bls.py " + fpath + "bls.py")
 
         replace(fpath + "fp12.py", "XXX", tc)
+        replace(fpath + "fp12flat.py", "XXX", tc)
         replace(fpath + "ecp2.py", "XXX", tc)
         replace(fpath + "pair.py", "XXX", tc)
         replace(fpath + "mpin.py", "XXX", tc)
@@ -107,6 +111,7 @@ print("4. GOLDILOCKS")
 print("5. NIST384")
 print("6. NIST521")
 print("7. SEC256K1")
+print("13. X448")
 
 
 print("Pairing-Friendly Elliptic Curves")
@@ -118,7 +123,7 @@ print("12. BN462")
 
 selection = []
 ptr = 0
-max = 13
+max = 14
 
 curve_selected = False
 pfcurve_selected = False
@@ -161,7 +166,7 @@ while ptr < max:
     if x == 6:
         curveset("nist521", "NOT")
         curve_selected = True
-    if x == 6:
+    if x == 7:
         curveset("sec256k1", "NOT")
         curve_selected = True
 
@@ -180,14 +185,19 @@ while ptr < max:
     if x == 12:
         curveset("bn462", "BN")
         pfcurve_selected = True
+    if x == 13:
+        curveset("x448", "NOT")
+        curve_selected = True
 
 os.system(deltext + " big.py")
 os.system(deltext + " fp.py")
 os.system(deltext + " ecp.py")
 os.system(deltext + " ecdh.py")
+os.system(deltext + " native.py")
 os.system(deltext + " fp2.py")
 os.system(deltext + " fp4.py")
 os.system(deltext + " fp12.py")
+os.system(deltext + " fp12flat.py")
 os.system(deltext + " mpin.py")
 os.system(deltext + " bls.py")
 os.system(deltext + " pair.py")
@@ -204,6 +214,7 @@ os.system(deltext + " bn462.py")
 os.system(deltext + " nist384.py")
 os.system(deltext + " nist521.py")
 os.system(deltext + " sec256k1.py")
+os.system(deltext + " x448.py")
 
 if testing:
     os.system("python test.py < pins.txt")
@@ -51,6 +51,9 @@ WEIERSTRASS = 0
 EDWARDS = 1
 MONTGOMERY = 2
 
+PSEUDO_MERSENNE = 1
+GENERALISED_MERSENNE = 2
+
 D_TYPE = 0
 M_TYPE = 1
 
@@ -60,5 +63,11 @@ POSITIVEX = 1
 BN = 0
 BLS = 1
 
+OBJECTS = 0
+FLAT = 1
+
+PROJECTIVE = 0
+JACOBIAN = 1
+
 ECDH_INVALID_PUBLIC_KEY = -2
 ECDH_ERROR = -3
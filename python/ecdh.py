@@ -59,15 +59,13 @@ from XXX.ecp import *
 # Calculate a public/private EC GF(p) key pair.
 
 
-def ECP_KeyPairGenerate(S):
-    G = generator()
-
+def ECP_KeyPairGenerate(S, rng=None):
     if S is None:
-        s = big.rand(curve.r)
+        s = big.rand(curve.r, rng)
     else:
         s = big.from_bytes(S) % curve.r
 
-    Y = s * G
+    Y = generator_mul(s)
 
     SK = big.to_bytes(s)
 
@@ -123,12 +121,61 @@ def ECP_SvdpDH(S, W):
     return K
 
 
+# Get many Diffie-Hellman shared keys from one private key, finishing
+# with a single inversion. ECDH_ERROR in place of a key for a bad point
+
+
+def ECP_SvdpDH_all(S, WL):
+    s = big.from_bytes(S) % curve.r
+    L = []
+    for W in WL:
+        WP = ECp()
+        if not WP.fromBytes(W):
+            L.append(None)
+            continue
+        if curve.CurveType == MONTGOMERY:
+            L.append(ladder(WP.getx(), s, s.bit_length()))
+        else:
+            L.append(s * WP)
+    if curve.CurveType == MONTGOMERY:
+        V = [XZ if XZ is not None else (0, 0) for XZ in L]
+        X = ladder_all(V)
+        inf = [XZ is None or XZ[1] == 0 for XZ in L]
+    else:
+        V = [WP if WP is not None else ECp() for WP in L]
+        ECp.normalize_all(V)
+        X = [WP.x.int() for WP in V]
+        inf = [WP.isinf() for WP in V]
+    K = []
+    for i in range(0, len(WL)):
+        if inf[i]:
+            K.append(ECDH_ERROR)
+        else:
+            K.append(big.to_bytes(X[i]))
+    return K
+
+
+# RFC 7748 X25519 and X448 on Montgomery curves, with little-endian
+# clamped scalar K and u-coordinate U
+
+
+def ECP_RFC7748(K, U):
+    p = curve.p
+    nb = p.bit_length()
+    k = int.from_bytes(K, 'little') & ((1 << nb) - 1)
+    k |= 1 << (nb - 1)
+    k &= -curve.CurveCof
+    u = (int.from_bytes(U, 'little') & ((1 << nb) - 1)) % p
+    X, Z = ladder(u, k, nb)
+    x = X * big.invmodp(Z, p) % p
+    return bytearray(x.to_bytes(curve.EFS, 'little'))
+
+
 # create ECDSA signature
 
 
-def ECP_SpDSA(S, F):
+def ECP_SpDSA(S, F, rng=None):
     FS = curve.EFS
-    G = generator()
     m = hashlib.new(curve.SHA)
     m.update(F)
     H = m.digest()
@@ -150,10 +197,9 @@ def ECP_SpDSA(S, F):
     c = 0
     d = 0
     while d == 0:
-        u = big.rand(curve.r)
-        w = big.rand(curve.r)  # masking
-        V = G.copy()
-        V = u * V
+        u = big.rand(curve.r, rng)
+        w = big.rand(curve.r, rng)  # masking
+        V = generator_mul(u)
         vx = V.getx()
         c = vx % r
         if c == 0:
@@ -50,15 +50,30 @@
 # Projective Weierstrass coordinates
 # M.Scott August 2013
 #
-import copy
 from constants import *
 
 from XXX import big
 from XXX import curve
+from XXX import native
 from XXX.fp import *
 
+# curve constants as ints mod p for the point formulas, b, 3b and
+# a24=(A-2)/4 for Montgomery curves
+CB = curve.B % curve.p
+CB3 = 3 * curve.B % curve.p
+A24 = (curve.A - 2) // 4 % curve.p
+
+# Fp from an int already reduced mod p
+
+
+def fp(x):
+    R = Fp.__new__(Fp)
+    R.x = x
+    return R
+
 
 class ECp:
+    __slots__ = ('x', 'y', 'z')
     A = Fp(curve.A)
     B = Fp(curve.B)
 
@@ -71,7 +86,11 @@ class ECp:
             self.z = Fp(0)
 
     def copy(self):
-        return copy.deepcopy(self)
+        R = ECp.__new__(ECp)
+        R.x = self.x.copy()
+        R.y = self.y.copy()
+        R.z = self.z.copy()
+        return R
 
 # convert to affine coordinates
     def affine(self):
@@ -84,6 +103,17 @@ class ECp:
         self.z = Fp(1)
         return self
 
+# convert a list of points to affine coordinates, using just one inversion
+    def normalize_all(L):
+        W = [P for P in L if not P.isinf() and not P.z.isone()]
+        IZ = Fp.batch_inverse([P.z for P in W])
+        for i in range(0, len(W)):
+            W[i].x *= IZ[i]
+            if curve.CurveType != MONTGOMERY:
+                W[i].y *= IZ[i]
+            W[i].z = Fp(1)
+        return L
+
 # check if point-at-infinity
     def isinf(self):
         if curve.CurveType == WEIERSTRASS:
@@ -97,6 +127,22 @@ class ECp:
                 return True
         return False
 
+# check membership of the order r subgroup. On BLS curves endo(P)=c.P with
+# c=x^2-1 or -x^2 as an integer, since c^2+c+1=r, by Scott's method
+    def in_subgroup(self):
+        if self.isinf():
+            return True
+        if curve.CurveCof == 1:
+            return True
+        if GLV and curve.PairingFriendly == BLS:
+            c = curve.x * curve.x
+            if (c - 1) % curve.r == curve.Lam:
+                c -= 1
+            else:
+                c = -c
+            return endo(self) == c * self
+        return (curve.r * self).isinf()
+
 # set to point-at-infinity
     def inf(self):
         self.x = Fp(0)
@@ -109,22 +155,28 @@ class ECp:
 
     def set(self, x, s=0):			# set point from x and LSB of y
         mx = Fp(x)
-        rhs = RHS(mx)
-        if rhs.qr() != 1:
+        if curve.CurveType == MONTGOMERY:
+            if RHS(mx).qr() != 1:
+                return False
+            self.x = mx
+            self.z = Fp(1)
+            return True
+        u, v = RHS_ratio(mx)
+        ok, y = Fp.sqrt_ratio(u, v)
+        if not ok:
             return False
         self.x = mx
         self.z = Fp(1)
-
-        if curve.CurveType != MONTGOMERY:
-            self.y = rhs.sqrt()
-            if big.bit(self.y.int(), 0) != s:
-                self.y = -self.y
+        self.y = y
+        if big.bit(self.y.int(), 0) != s:
+            self.y = -self.y
         return True
 
     def setxy(self, x, y):
         mx = Fp(x)
         my = Fp(y)
-        if my * my != RHS(mx):
+        u, v = RHS_ratio(mx)
+        if my * my * v != u:
             return False
         self.x = mx
         self.y = my
@@ -188,409 +240,205 @@ class ECp:
                 s.x = -s.x
         return s
 
-# use exception-free formulae
+# use exception-free formulae, straight-line on ints
     def dbl(self):
+        red = big.modreduce
+        X = self.x.x
+        Y = self.y.x
+        Z = self.z.x
         if curve.CurveType == WEIERSTRASS:
-            if ECp.A.iszero():
-                t0 = self.y.copy()
-                t0 = t0 * t0
-                t1 = self.y.copy()
-                t1 = t1 * self.z
-                t2 = self.z.copy()
-                t2 = t2 * t2
-                self.z = t0 + t0
-
-                self.z += self.z
-                self.z += self.z
-                t2 *= (ECp.B + ECp.B + ECp.B)
-                x3 = t2 * self.z
+            if curve.A == 0:
+                t0 = red(Y * Y)
+                t1 = red(Y * Z)
+                t2 = red(Z * Z * CB3)
+                z3 = 8 * t0
+                x3 = t2 * z3
                 y3 = t0 + t2
-                self.z *= t1
-                t1 = t2 + t2
-                t2 += t1
-                t0 -= t2
-                y3 *= t0
-                y3 += x3
-                t1 = self.x * self.y
-                self.x = t0
-                self.x *= t1
-                self.x += self.x
-                self.y = y3
+                t0 -= 3 * t2
+                self.x = fp(red(2 * t0 * X * Y))
+                self.y = fp(red(y3 * t0 + x3))
+                self.z = fp(red(z3 * t1))
             else:
-                t0 = self.x.copy()
-                t1 = self.y.copy()
-                t2 = self.z.copy()
-                t3 = self.x.copy()
-                z3 = self.z.copy()
-                y3 = Fp(0)
-                x3 = Fp(0)
-                b = ECp.B
-
-                t0 *= t0
-                t1 *= t1
-                t2 *= t2
-
-                t3 *= self.y
-                t3 += t3
-
-                z3 *= self.x
-                z3 += z3
-
-                y3 = t2 * b
-
-                y3 -= z3
-                x3 = y3 + y3
-
-                y3 += x3
+                t0 = red(X * X)
+                t1 = red(Y * Y)
+                t2 = red(Z * Z)
+                t3 = red(2 * X * Y)
+                z3 = red(2 * X * Z)
+                y3 = red(3 * (CB * t2 - z3))
                 x3 = t1 - y3
-                y3 += t1
-                y3 *= x3
-                x3 *= t3
-                t3 = t2 + t2
-                t2 += t3
-                z3 *= b
-
-                z3 -= t2
-                z3 -= t0
-                t3 = z3 + z3
-
-                z3 += t3
-                t3 = t0 + t0
-                t0 += t3
-                t0 -= t2
-
-                t0 *= z3
-                y3 += t0
-                t0 = self.y * self.z
-                t0 += t0
-                z3 *= t0
-                x3 -= z3
-                t0 += t0
-                t1 += t1
-                z3 = t0 * t1
-
-                self.x = x3
-                self.y = y3
-                self.z = z3
+                y3 = red((t1 + y3) * x3)
+                x3 = red(x3 * t3)
+                t2 = 3 * t2
+                z3 = red(3 * (CB * z3 - t2 - t0))
+                t0 = 3 * t0 - t2
+                t1 = red(2 * Y * Z)
+                self.x = fp(red(x3 - z3 * t1))
+                self.y = fp(red(y3 + t0 * z3))
+                self.z = fp(red(4 * t1 * Y * Y))
 
         if curve.CurveType == EDWARDS:
-            C = self.x.copy()
-            D = self.y.copy()
-            H = self.z.copy()
-            J = Fp(0)
-
-            self.x *= self.y
-            self.x += self.x
-            C *= C
-            D *= D
-
-            if ECp.A == Fp(-1):
+            C = red(X * X)
+            D = red(Y * Y)
+            if curve.A == -1:
                 C = -C
-
-            self.y = C + D
-            H *= H
-            H += H
-
-            self.z = self.y.copy()
-            J = self.y.copy()
-
-            J -= H
-            self.x *= J
-
-            C -= D
-            self.y *= C
-            self.z *= J
+            E = C + D
+            J = E - 2 * Z * Z
+            self.x = fp(red(2 * X * Y * J))
+            self.y = fp(red(E * (C - D)))
+            self.z = fp(red(E * J))
 
         if curve.CurveType == MONTGOMERY:
-            A = self.x.copy()
-            B = self.x.copy()
-            AA = Fp(0)
-            BB = Fp(0)
-            C = Fp(0)
-
-            A += self.z
-            AA = A * A
-            B -= self.z
-            BB = B * B
-            C = AA
+            A = X + Z
+            B = X - Z
+            AA = red(A * A)
+            BB = red(B * B)
             C = AA - BB
-            self.x = AA * BB
-
-            A = C * ((ECp.A + Fp(2)).div2().div2())
-
-            BB += A
-            self.z = BB * C
+            self.x = fp(red(AA * BB))
+            self.z = fp(red(C * (AA + A24 * C)))
 
         return self
 
     def add(self, other):
+        red = big.modreduce
+        X1 = self.x.x
+        Y1 = self.y.x
+        Z1 = self.z.x
+        X2 = other.x.x
+        Y2 = other.y.x
+        Z2 = other.z.x
         if curve.CurveType == WEIERSTRASS:
-            if ECp.A.iszero():
-                b = (ECp.B + ECp.B + ECp.B)
-                t0 = self.x.copy()
-                t0 *= other.x
-                t1 = self.y.copy()
-                t1 *= other.y
-                t2 = self.z.copy()
-                t2 = t2 * other.z
-                t3 = self.x.copy()
-                t3 += self.y
-                t4 = other.x + other.y
-                t3 *= t4
-                t4 = t0 + t1
-
-                t3 -= t4
-                t4 = self.y + self.z
-                x3 = other.y + other.z
-
-                t4 *= x3
-                x3 = t1 + t2
-
-                t4 -= x3
-                x3 = self.x + self.z
-                y3 = other.x + other.z
-                x3 *= y3
-                y3 = t0 + t2
-                y3 = x3 - y3
-                x3 = t0 + t0
-                t0 += x3
-                t2 *= b
-
+            t0 = red(X1 * X2)
+            t1 = red(Y1 * Y2)
+            t2 = red(Z1 * Z2)
+            t3 = red((X1 + Y1) * (X2 + Y2) - t0 - t1)
+            t4 = red((Y1 + Z1) * (Y2 + Z2) - t1 - t2)
+            y3 = red((X1 + Z1) * (X2 + Z2) - t0 - t2)
+            if curve.A == 0:
+                y3 = red(y3 * CB3)
+                t0 = 3 * t0
+                t2 = red(t2 * CB3)
                 z3 = t1 + t2
-                t1 -= t2
-                y3 *= b
-
-                x3 = y3 * t4
-                t2 = t3 * t1
-                x3 = t2 - x3
-                y3 *= t0
-                t1 *= z3
-                y3 += t1
-                t0 *= t3
-                z3 *= t4
-                z3 += t0
-
-                self.x = x3
-                self.y = y3
-                self.z = z3
-
+                t1 = t1 - t2
+                self.x = fp(red(t3 * t1 - y3 * t4))
+                self.y = fp(red(y3 * t0 + t1 * z3))
+                self.z = fp(red(z3 * t4 + t0 * t3))
             else:
-
-                t0 = self.x.copy()
-                t1 = self.y.copy()
-                t2 = self.z.copy()
-                t3 = self.x.copy()
-                t4 = other.x.copy()
-                z3 = Fp(0)
-                y3 = other.x.copy()
-                x3 = other.y.copy()
-                b = ECp.B
-
-                t0 *= other.x
-                t1 *= other.y
-                t2 *= other.z
-
-                t3 += self.y
-                t4 += other.y
-                t3 *= t4
-                t4 = t0 + t1
-                t3 -= t4
-
-                t4 = self.y + self.z
-                x3 += other.z
-                t4 *= x3
-                x3 = t1 + t2
-
-                t4 -= x3
-                x3 = self.x + self.z
-                y3 += other.z
-
-                x3 *= y3
-                y3 = t0 + t2
-
-                y3 = x3 - y3
-                z3 = t2 * b
-
-                x3 = y3 - z3
-                z3 = x3 + x3
-
-                x3 += z3
+                x3 = red(3 * (y3 - CB * t2))
                 z3 = t1 - x3
-                x3 += t1
-
-                y3 *= b
-
-                t1 = t2 + t2
-                t2 += t1
-
-                y3 -= t2
-
-                y3 -= t0
-                t1 = y3 + y3
-                y3 += t1
-
-                t1 = t0 + t0
-                t0 += t1
-                t0 -= t2
-                t1 = t4 * y3
-                t2 = t0 * y3
-                y3 = x3 * z3
-                y3 += t2
-                x3 *= t3
-                x3 -= t1
-                z3 *= t4
-                t1 = t3 * t0
-                z3 += t1
-                self.x = x3
-                self.y = y3
-                self.z = z3
+                x3 = x3 + t1
+                t2 = 3 * t2
+                y3 = red(3 * (CB * y3 - t2 - t0))
+                t0 = 3 * t0 - t2
+                self.x = fp(red(x3 * t3 - t4 * y3))
+                self.y = fp(red(x3 * z3 + t0 * y3))
+                self.z = fp(red(z3 * t4 + t3 * t0))
 
         if curve.CurveType == EDWARDS:
-            A = self.z.copy()
-            B = Fp(0)
-            C = self.x.copy()
-            D = self.y.copy()
-            E = Fp(0)
-            F = Fp(0)
-            G = Fp(0)
-            b = ECp.B
-
-            # print(self.z.int())
-
-            A *= (other.z)
-            B = A * A
-            C *= (other.x)
-            D *= (other.y)
-            # print(other.z.int())
-            E = C * D
-            E *= b
-
+            A = red(Z1 * Z2)
+            B = red(A * A)
+            C = red(X1 * X2)
+            D = red(Y1 * Y2)
+            E = red(CB * C * D)
             F = B - E
             G = B + E
-
-            if (ECp.A == Fp(1)):
-                E = D - C
-
-            C += D
-
-            B = self.x + self.y
-            D = other.x + other.y
-            B *= D
-            B -= C
-            B *= F
-            self.x = A * B
-
-            if ECp.A == Fp(1):
-                C = E * G
-            if ECp.A == Fp(-1):
-                C *= G
-
-            self.y = A * C
-
-            self.z = F
-            self.z *= G
+            self.x = fp(red(A * F * ((X1 + Y1) * (X2 + Y2) - C - D)))
+            if curve.A == 1:
+                self.y = fp(red(A * G * (D - C)))
+            else:
+                self.y = fp(red(A * G * (D + C)))
+            self.z = fp(red(F * G))
 
         return self
 
 # For Montgomery use only
     def dadd(self, Q, W):
-        A = self.x.copy()
-        B = self.x.copy()
-        C = Q.x.copy()
-        D = Q.x.copy()
-        DA = Fp(0)
-        CB = Fp(0)
-
-        A += self.z
-        B -= self.z
-
-        C += Q.z
-        D -= Q.z
-
-        DA = D * A
-
-        CB = C * B
-
-        A = DA + CB
-        A *= A
-        B = DA - CB
-        B *= B
-
-        self.x = A
-        self.z = W.x * B
+        red = big.modreduce
+        A = self.x.x + self.z.x
+        B = self.x.x - self.z.x
+        da = red((Q.x.x - Q.z.x) * A)
+        cb = red((Q.x.x + Q.z.x) * B)
+        self.x = fp(red((da + cb) * (da + cb)))
+        self.z = fp(red(W.x.x * (da - cb) * (da - cb)))
 
         return self
 
-    def __rmul__(self, other):   # use NAF
+    def __rmul__(self, other):   # use wNAF
         R = ECp()
+        if native.active() and native.fits(other) and not self.isinf():
+            W = native.ecp_mul(self.toBytes(False), other)
+            if W is not None:
+                R.fromBytes(W)
+            return R
         if curve.CurveType == MONTGOMERY:
-            e = other
-            D = ECp()
-            R0 = self.copy()
-            R1 = self.copy()
-            R1.dbl()
-
-            D = self.copy()
-            nb = e.bit_length()
-            # nb=curve.r.bit_length()
-            for i in range(nb - 2, -1, -1):
-                b = big.bit(e, i)
-                R = R1.copy()
-
-                R.dadd(R0, D)
-                if b == 1:
-                    R0, R1 = R1, R0
-                R1 = R.copy()
-                R0.dbl()
-                if b == 1:
-                    R0, R1 = R1, R0
-            R = R0.copy()
-
+            if self.isinf():
+                return R
+            X, Z = ladder(self.getx(), other, other.bit_length())
+            R.x = Fp(X)
+            R.z = Fp(Z)
         else:
             b = other
-            b3 = 3 * b
-            k = b3.bit_length()
-            # k=curve.r.bit_length()+2;
-
-            mself = -self
-            for i in range(k - 1, 0, -1):
+            if b <= 0:
+                if b < 0:
+                    return (-b) * (-self)
+                return R
+            if GLV and curve.CurveCof == 1:
+                return glv_mul(self, b)
+            w = big.wnafw(b.bit_length())
+            D = big.wnaf(b, w)
+            T = ECp.oddmultiples(self, w)
+            if EXTENDED:
+                return xmul(D, T)
+            if JAC:
+                return jmul(D, T)
+            NT = [-P for P in T]
+            R = T[D[-1] >> 1].copy()
+            for i in range(len(D) - 2, -1, -1):
                 R.dbl()
-                if big.bit(b3, i) == 1 and big.bit(b, i) == 0:
-                    R.add(self)
-                if big.bit(b3, i) == 0 and big.bit(b, i) == 1:
-                    R.add(mself)
+                d = D[i]
+                if d > 0:
+                    R.add(T[d >> 1])
+                if d < 0:
+                    R.add(NT[-d >> 1])
         return R
 
-    def mul(P, a, Q, b):  # double multiplication a*P+b*Q
-        # P.affine()
-        # Q.affine()
+# P,3P,5P,..,(2^(w-1)-1)P in affine form, using one inversion
+    def oddmultiples(P, w):
+        T = [P.copy()]
+        P2 = P.copy()
+        P2.dbl()
+        for i in range(1, 1 << (w - 2)):
+            Q = T[i - 1].copy()
+            Q.add(P2)
+            T.append(Q)
+        return ECp.normalize_all(T)
+
+# double multiplication a*P+b*Q, interleaved wNAF with shared doublings.
+# If P or Q is the generator its odd multiples come from the fixed base table
+    def mul(P, a, Q, b):
         if a < 0:
             a = -a
             P = -P
         if b < 0:
             b = -b
             Q = -Q
-        R = ECp()
-        ia = a.bit_length()
-        ib = b.bit_length()
-        k = ia
-        if (ib > ia):
-            k = ib
-        k = curve.r.bit_length()
-        W = P.copy()
-        W.add(Q)
-        # W.affine()
-        for i in range(k - 1, -1, -1):
-            R.dbl()
-            if (big.bit(a, i) == 1):
-                if (big.bit(b, i) == 1):
-                    R.add(W)
-                else:
-                    R.add(P)
+        G = generator()
+        if P == G:
+            P, a, Q, b = Q, b, P, a
+        w = big.wnafw(a.bit_length())
+        L = [mtable(big.wnaf(a, w), ECp.oddmultiples(P, w))]
+        if Q == G:
+            if EXTENDED:
+                T = gniels()
+            elif JAC:
+                T = gaffine()
             else:
-                if (big.bit(b, i) == 1):
-                    R.add(Q)
-        return R
+                T = gtable()
+            T = T[0:1 << (GTW - 1):2]
+            L.append((big.wnaf(b, GTW), T, [mneg(V) for V in T]))
+        else:
+            w = big.wnafw(b.bit_length())
+            L.append(mtable(big.wnaf(b, w), ECp.oddmultiples(Q, w)))
+        return straus(L)
 
     def __str__(self):			# pretty print
         W = self.copy()
@@ -657,6 +505,11 @@ class ECp:
 
         return PK
 
+# convert a list of points to arrays of bytes
+    def toBytes_all(L, compress):
+        ECp.normalize_all(L)
+        return [P.toBytes(compress) for P in L]
+
 # calculate Right Hand Side of elliptic curve equation y^2=RHS(x)
 
 
@@ -668,6 +521,466 @@ def RHS(x):
     if curve.CurveType == MONTGOMERY:
         return x * x * x + ECp.A * x * x + x
 
+# RHS(x) as a numerator and denominator, to avoid the inversion on Edwards curves
+
+
+def RHS_ratio(x):
+    if curve.CurveType == EDWARDS:
+        x2 = x * x
+        return (ECp.A * x2 - Fp(1), ECp.B * x2 - Fp(1))
+    return (RHS(x), Fp(1))
+
+# Extended twisted Edwards coordinates (X:Y:Z:T), T=XY/Z, for a=-1 or 1,
+# as tuples of ints. Table entries are affine, in Niels form:
+# (y+x,y-x,2dxy) for a=-1, (x,y,x+y,dxy) for a=1
+EXTENDED = curve.CurveType == EDWARDS and curve.A in (-1, 1)
+if EXTENDED:
+    EDD = curve.B % curve.p
+
+
+def niels(P):
+    red = big.modreduce
+    x = P.x.int()
+    y = P.y.int()
+    if curve.A == -1:
+        return (red(y + x), red(y - x), red(2 * EDD * x * y))
+    return (x, y, red(x + y), red(EDD * x * y))
+
+
+def nniels(N):
+    red = big.modreduce
+    if curve.A == -1:
+        return (N[1], N[0], red(-N[2]))
+    return (red(-N[0]), N[1], red(N[1] - N[0]), red(-N[3]))
+
+# doubling, 4M+4S, and T only if needed
+
+
+def xdbl(P, t):
+    red = big.modreduce
+    X, Y, Z, T = P
+    A = red(X * X)
+    B = red(Y * Y)
+    C = 2 * Z * Z
+    E = (X + Y) * (X + Y) - A - B
+    if curve.A == -1:
+        A = -A
+    G = A + B
+    F = G - C
+    H = A - B
+    if t:
+        return (red(E * F), red(G * H), red(F * G), red(E * H))
+    return (red(E * F), red(G * H), red(F * G), 0)
+
+# mixed addition of a Niels form point, 7M for a=-1, 8M for a=1
+
+
+def xadd(P, N):
+    red = big.modreduce
+    X, Y, Z, T = P
+    if curve.A == -1:
+        A = red((Y - X) * N[1])
+        B = red((Y + X) * N[0])
+        C = red(T * N[2])
+        D = Z + Z
+        E = B - A
+        H = B + A
+    else:
+        A = red(X * N[0])
+        B = red(Y * N[1])
+        C = red(T * N[3])
+        D = Z
+        E = (X + Y) * N[2] - A - B
+        H = B - A
+    F = D - C
+    G = D + C
+    return (red(E * F), red(G * H), red(F * G), red(E * H))
+
+
+def xtoecp(P):
+    R = ECp()
+    R.x = Fp(P[0])
+    R.y = Fp(P[1])
+    R.z = Fp(P[2])
+    return R
+
+# wNAF digits D and affine table T of odd multiples
+
+
+def xmul(D, T):
+    N = [niels(P) for P in T]
+    NN = [nniels(P) for P in N]
+    x = T[D[-1] >> 1].x.int()
+    y = T[D[-1] >> 1].y.int()
+    R = (x, y, 1, x * y % curve.p)
+    for i in range(len(D) - 2, -1, -1):
+        d = D[i]
+        R = xdbl(R, d != 0)
+        if d > 0:
+            R = xadd(R, N[d >> 1])
+        if d < 0:
+            R = xadd(R, NN[-d >> 1])
+    return xtoecp(R)
+
+# Jacobian coordinates (X:Y:Z), x=X/Z^2 and y=Y/Z^3, for A=-3 or A=0,
+# as tuples of ints. Tables stay affine, (x,y) or None for infinity
+JAC = curve.CurveType == WEIERSTRASS and curve.Coords == JACOBIAN and curve.A in (0, -3)
+
+
+def jaffine(P):
+    if P.isinf():
+        return None
+    return (P.x.int(), P.y.int())
+
+# doubling, 3M+5S for A=-3, 2M+5S for A=0
+
+
+def jdbl(P):
+    red = big.modreduce
+    X, Y, Z = P
+    if curve.A == -3:
+        d = red(Z * Z)
+        g = red(Y * Y)
+        b = red(X * g)
+        a = red(3 * (X - d) * (X + d))
+        X3 = red(a * a - 8 * b)
+        Y3 = red(a * (4 * b - X3) - 8 * g * g)
+        Z3 = red((Y + Z) * (Y + Z) - g - d)
+    else:
+        A = red(X * X)
+        B = red(Y * Y)
+        C = red(B * B)
+        D = red(2 * ((X + B) * (X + B) - A - C))
+        E = 3 * A
+        X3 = red(E * E - 2 * D)
+        Y3 = red(E * (D - X3) - 8 * C)
+        Z3 = red(2 * Y * Z)
+    return (X3, Y3, Z3)
+
+# mixed addition of an affine point, 7M+4S
+
+
+def jadd(P, Q):
+    if Q is None:
+        return P
+    red = big.modreduce
+    X, Y, Z = P
+    x, y = Q
+    if Z == 0:
+        return (x, y, 1)
+    zz = red(Z * Z)
+    H = red(x * zz - X)
+    r = red(2 * (y * Z * zz - Y))
+    if H == 0:
+        if r == 0:
+            return jdbl(P)
+        return (1, 1, 0)
+    HH = red(H * H)
+    I = 4 * HH
+    J = red(H * I)
+    V = red(X * I)
+    X3 = red(r * r - J - 2 * V)
+    Y3 = red(r * (V - X3) - 2 * Y * J)
+    Z3 = red((Z + H) * (Z + H) - zz - HH)
+    return (X3, Y3, Z3)
+
+
+def jneg(Q):
+    if Q is None:
+        return None
+    return (Q[0], curve.p - Q[1])
+
+
+def jtoecp(P):
+    R = ECp()
+    X, Y, Z = P
+    if Z == 0:
+        return R
+    R.x = Fp(X * Z)
+    R.y = Fp(Y)
+    R.z = Fp(Z * Z * Z)
+    return R
+
+# wNAF digits D and affine table T of odd multiples
+
+
+def jmul(D, T):
+    A = [jaffine(P) for P in T]
+    NA = [jneg(Q) for Q in A]
+    R = jadd((1, 1, 0), A[D[-1] >> 1])
+    for i in range(len(D) - 2, -1, -1):
+        R = jdbl(R)
+        d = D[i]
+        if d > 0:
+            R = jadd(R, A[d >> 1])
+        if d < 0:
+            R = jadd(R, NA[-d >> 1])
+    return jtoecp(R)
+
+# Montgomery x-only ladder on (X:Z) ints, as RFC 7748, with a24=(A-2)/4
+# precomputed. Returns (X:Z) for e.x over the low nb bits of e
+
+
+def ladder(x, e, nb):
+    red = big.modreduce
+    a24 = A24
+    x2, z2, x3, z3 = 1, 0, x, 1
+    swap = 0
+    for i in range(nb - 1, -1, -1):
+        b = (e >> i) & 1
+        if swap != b:
+            x2, x3 = x3, x2
+            z2, z3 = z3, z2
+        swap = b
+        A = x2 + z2
+        B = x2 - z2
+        AA = red(A * A)
+        BB = red(B * B)
+        E = AA - BB
+        DA = red((x3 - z3) * A)
+        CB = red((x3 + z3) * B)
+        x3 = red((DA + CB) * (DA + CB))
+        z3 = red(x * (DA - CB) * (DA - CB))
+        x2 = red(AA * BB)
+        z2 = red(E * (AA + a24 * E))
+    if swap == 1:
+        x2, z2 = x3, z3
+    return (x2, z2)
+
+# affine x of many (X:Z) with one inversion, 0 for infinity
+
+
+def ladder_all(L):
+    red = big.modreduce
+    I = big.invmodp_batch([z for _, z in L], curve.p)
+    return [red(x * i) for (x, _), i in zip(L, I)]
+
+# full additions, for sums of buckets
+
+
+def jjadd(P, Q):
+    red = big.modreduce
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+    if Z1 == 0:
+        return Q
+    if Z2 == 0:
+        return P
+    z1 = red(Z1 * Z1)
+    z2 = red(Z2 * Z2)
+    U1 = red(X1 * z2)
+    S1 = red(Y1 * Z2 * z2)
+    H = red(X2 * z1 - U1)
+    r = red(2 * (Y2 * Z1 * z1 - S1))
+    if H == 0:
+        if r == 0:
+            return jdbl(P)
+        return (1, 1, 0)
+    I = red(4 * H * H)
+    J = red(H * I)
+    V = red(U1 * I)
+    X3 = red(r * r - J - 2 * V)
+    Y3 = red(r * (V - X3) - 2 * S1 * J)
+    Z3 = red(((Z1 + Z2) * (Z1 + Z2) - z1 - z2) * H)
+    return (X3, Y3, Z3)
+
+
+def xxadd(P, Q):
+    red = big.modreduce
+    X1, Y1, Z1, T1 = P
+    X2, Y2, Z2, T2 = Q
+    if curve.A == -1:
+        A = red((Y1 - X1) * (Y2 - X2))
+        B = red((Y1 + X1) * (Y2 + X2))
+        C = red(2 * EDD * T1 * T2)
+        D = red(2 * Z1 * Z2)
+        E = B - A
+        H = B + A
+    else:
+        A = red(X1 * X2)
+        B = red(Y1 * Y2)
+        C = red(EDD * T1 * T2)
+        D = red(Z1 * Z2)
+        E = (X1 + Y1) * (X2 + Y2) - A - B
+        H = B - A
+    F = D - C
+    G = D + C
+    return (red(E * F), red(G * H), red(F * G), red(E * H))
+
+# Point engine used by multi_mul. Points are tuples of ints in extended
+# or Jacobian coordinates, else ECp objects. Table entries are affine
+
+
+def mtab(P):
+    if EXTENDED:
+        return niels(P)
+    if JAC:
+        return jaffine(P)
+    return P
+
+
+def mneg(V):
+    if EXTENDED:
+        return nniels(V)
+    if JAC:
+        return jneg(V)
+    return -V
+
+
+def minf():
+    if EXTENDED:
+        return (0, 1, 1, 0)
+    if JAC:
+        return (1, 1, 0)
+    return ECp()
+
+
+def mdbl(R):
+    if EXTENDED:
+        return xdbl(R, True)
+    if JAC:
+        return jdbl(R)
+    return R.dbl()
+
+
+def madd(R, V):
+    if EXTENDED:
+        return xadd(R, V)
+    if JAC:
+        return jadd(R, V)
+    return R.add(V)
+
+
+def mfull(R, S):
+    if EXTENDED:
+        return xxadd(R, S)
+    if JAC:
+        return jjadd(R, S)
+    return R.add(S)
+
+
+def mout(R):
+    if EXTENDED:
+        return xtoecp(R)
+    if JAC:
+        return jtoecp(R)
+    return R
+
+# wNAF digits D and odd multiples T, as a table and its negation for straus
+
+
+def mtable(D, T):
+    V = [mtab(P) for P in T]
+    return (D, V, [mneg(Q) for Q in V])
+
+# Straus interleaved multiplication, sum of D.T for each (D, T, -T) in L
+
+
+def straus(L):
+    k = max(len(D) for D, _, _ in L)
+    R = minf()
+    for i in range(k - 1, -1, -1):
+        R = mdbl(R)
+        for D, V, NV in L:
+            if i < len(D):
+                d = D[i]
+                if d > 0:
+                    R = madd(R, V[d >> 1])
+                if d < 0:
+                    R = madd(R, NV[-d >> 1])
+    return mout(R)
+
+# sum of scalars[i].points[i]. Straus interleaved wNAF for a few points,
+# Pippenger with signed digit buckets for many. Straus below MULTI_N
+MULTI_N = 32
+
+
+def multi_mul(points, scalars):
+    L = []
+    E = []
+    for P, e in zip(points, scalars):
+        if e == 0 or P.isinf():
+            continue
+        if e < 0:
+            P = -P
+            e = -e
+        L.append(P.copy())
+        E.append(e)
+    if len(L) == 0:
+        return ECp()
+    if len(L) < MULTI_N:
+        T = []
+        for P, e in zip(L, E):
+            w = big.wnafw(e.bit_length())
+            T.append(mtable(big.wnaf(e, w), ECp.oddmultiples(P, w)))
+        return straus(T)
+    ECp.normalize_all(L)
+    V = [mtab(P) for P in L]
+    NV = [mneg(Q) for Q in V]
+    nb = max(e.bit_length() for e in E)
+    c = big.pippw(len(L), nb)
+    k = nb // c + 1
+    D = [big.sdigits(e, c, k) for e in E]
+    h = 1 << (c - 1)
+    R = minf()
+    for i in range(k - 1, -1, -1):
+        for j in range(0, c):
+            R = mdbl(R)
+        B = [None] * (h + 1)
+        for n in range(0, len(L)):
+            d = D[n][i]
+            if d == 0:
+                continue
+            if d > 0:
+                Q = V[n]
+            else:
+                Q = NV[n]
+                d = -d
+            if B[d] is None:
+                B[d] = minf()
+            B[d] = madd(B[d], Q)
+        S = minf()
+        T = minf()
+        for j in range(h, 0, -1):
+            if B[j] is not None:
+                S = mfull(S, B[j])
+            T = mfull(T, S)
+        R = mfull(R, T)
+    return mout(R)
+
+# GLV endomorphism (x,y) -> (Cru.x,y), which is Lam.(x,y) on points of
+# order r. e=k1+k2.Lam mod r with k1,k2 about half the length of r
+GLV = curve.CurveType == WEIERSTRASS and hasattr(curve, 'Cru')
+
+
+def endo(P):
+    R = P.copy()
+    R.x *= Fp(curve.Cru)
+    return R
+
+
+def glv(e):
+    r = curve.r
+    (a1, b1), (a2, b2) = curve.Glv
+    c1 = (b2 * e + r // 2) // r
+    c2 = (-b1 * e + r // 2) // r
+    return (e - c1 * a1 - c2 * a2, -c1 * b1 - c2 * b2)
+
+# e.P for P of order r, as k1.P+k2.endo(P) on half length scalars
+
+
+def glv_mul(P, e):
+    k1, k2 = glv(e % curve.r)
+    w = big.wnafw(max(abs(k1), abs(k2)).bit_length())
+    T = ECp.oddmultiples(P, w)
+    A = mtable(big.wnaf(abs(k1), w), T)
+    B = mtable(big.wnaf(abs(k2), w), [endo(V) for V in T])
+    if k1 < 0:
+        A = (A[0], A[2], A[1])
+    if k2 < 0:
+        B = (B[0], B[2], B[1])
+    return straus([A, B])
+
 # get group generator point
 
 
@@ -679,3 +992,96 @@ def generator():
         G.setxy(curve.Gx, curve.Gy)
 
     return G
+
+
+# Fixed base table for the generator, built on first use. Row i holds
+# j.2^(wi).G for j=1..2^(w-1), about (n/w).2^(w-1) points for an n-bit
+# group order. Set GTW before first use to trade memory for speed
+GTW = 4
+GTAB = None
+
+
+def gtable():
+    global GTAB
+    if GTAB is None:
+        w = GTW
+        B = generator()
+        T = []
+        for i in range(0, (curve.r.bit_length() + w) // w + 1):
+            R = B.copy()
+            for j in range(1, 1 << (w - 1)):
+                Q = R.copy()
+                Q.add(B)
+                T.append(R)
+                R = Q
+            T.append(R)
+            B = R.copy()
+            B.dbl()
+        GTAB = ECp.normalize_all(T)
+    return GTAB
+
+# the table in Niels form, for extended Edwards coordinates
+GNTAB = None
+
+
+def gniels():
+    global GNTAB
+    if GNTAB is None:
+        GNTAB = [niels(P) for P in gtable()]
+    return GNTAB
+
+# the table as int pairs, for Jacobian coordinates
+GJTAB = None
+
+
+def gaffine():
+    global GJTAB
+    if GJTAB is None:
+        GJTAB = [jaffine(P) for P in gtable()]
+    return GJTAB
+
+# e.G from the fixed base table, signed digits, no doublings
+
+
+def generator_mul(e):
+    if curve.CurveType == MONTGOMERY or native.active():
+        return e * generator()
+    w = GTW
+    T = gtable()
+    e %= curve.r
+    h = 1 << (w - 1)
+    R = ECp()
+    if EXTENDED:
+        N = gniels()
+        R = (0, 1, 1, 0)
+    if JAC:
+        N = gaffine()
+        R = (1, 1, 0)
+    i = 0
+    while e > 0:
+        t = e & ((1 << w) - 1)
+        e >>= w
+        if t > h:
+            t -= 1 << w
+            e += 1
+        if EXTENDED:
+            if t > 0:
+                R = xadd(R, N[i + t - 1])
+            if t < 0:
+                R = xadd(R, nniels(N[i - t - 1]))
+        elif JAC:
+            if t > 0:
+                R = jadd(R, N[i + t - 1])
+            if t < 0:
+                R = jadd(R, jneg(N[i - t - 1]))
+        else:
+            if t > 0:
+                R.add(T[i + t - 1])
+            if t < 0:
+                R.add(-T[i - t - 1])
+        i += h
+    if EXTENDED:
+        return xtoecp(R)
+    if JAC:
+        return jtoecp(R)
+    return R
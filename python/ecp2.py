@@ -51,15 +51,19 @@
 # M.Scott August 2013
 #
 
-import copy
+import hashlib
 
 from XXX import big
 from XXX import curve
+from XXX import native
 from XXX.fp2 import *
 from XXX.ecp import *
 
 
 class ECp2:
+    __slots__ = ('x', 'y', 'z')
+# constant B' of the sextic twist y^2=x^3+B'
+    B = TWB
 
     def __init__(self):
         self.x = Fp2()
@@ -67,7 +71,11 @@ class ECp2:
         self.z = Fp2()
 
     def copy(self):
-        return copy.deepcopy(self)
+        R = ECp2.__new__(ECp2)
+        R.x = self.x.copy()
+        R.y = self.y.copy()
+        R.z = self.z.copy()
+        return R
 
 # convert to affine coordinates
     def affine(self):
@@ -79,6 +87,16 @@ class ECp2:
         self.z = Fp2(Fp(1))
         return self
 
+# convert a list of points to affine coordinates, using just one inversion
+    def normalize_all(L):
+        W = [P for P in L if not P.isinf() and not P.z.isone()]
+        IZ = Fp2.batch_inverse([P.z for P in W])
+        for i in range(0, len(W)):
+            W[i].x *= IZ[i]
+            W[i].y *= IZ[i]
+            W[i].z = Fp2(Fp(1))
+        return L
+
 # check if point-at-infinity
     def isinf(self):
         if self.x.iszero() and self.z.iszero():
@@ -98,10 +116,9 @@ class ECp2:
 
     def setx(self,x,s):
         mx = x.copy()
-        rhs = RHS(mx)
-        if rhs.qr() != 1:
+        ok, rhs = RHS(mx).qrsqrt()
+        if not ok:
             return False
-        rhs.sqrt()
         if rhs.sign() != s:
             rhs = - rhs
         self.x = mx
@@ -241,36 +258,105 @@ class ECp2:
         self.z = z3
         return self
 
-    def __rmul__(self, other):   # use NAF
+    def __rmul__(self, other):   # use wNAF
         b = other
-        b3 = 3 * b
-        k = b3.bit_length()
-        #k = curve.r.bit_length()+2
-        # self.affine()
-        mself = -self
         R = ECp2()
-        for i in range(k - 1, 0, -1):
+        if native.active() and native.fits(b) and not self.isinf():
+            W = native.ecp2_mul(self.toBytes(False), b)
+            if W is not None:
+                R.fromBytes(W)
+            return R
+        if b <= 0:
+            if b < 0:
+                return (-b) * (-self)
+            return R
+        w = big.wnafw(b.bit_length())
+        D = big.wnaf(b, w)
+        T = ECp2.oddmultiples(self, w)
+        NT = [-P for P in T]
+        R = T[D[-1] >> 1].copy()
+        for i in range(len(D) - 2, -1, -1):
             R.dbl()
-            if big.bit(b3, i) == 1 and big.bit(b, i) == 0:
-                R.add(self)
-            if big.bit(b3, i) == 0 and big.bit(b, i) == 1:
-                R.add(mself)
+            d = D[i]
+            if d > 0:
+                R.add(T[d >> 1])
+            if d < 0:
+                R.add(NT[-d >> 1])
         return R
 
+# P,3P,5P,..,(2^(w-1)-1)P in affine form, using one inversion
+    def oddmultiples(P, w):
+        T = [P.copy()]
+        P2 = P.copy()
+        P2.dbl()
+        for i in range(1, 1 << (w - 2)):
+            Q = T[i - 1].copy()
+            Q.add(P2)
+            T.append(Q)
+        return ECp2.normalize_all(T)
+
 # calculate p.P(x,y) using frobenius
     def frobenius(self):
-        X = Fp2(Fp(curve.Fra), Fp(curve.Frb))
-        if curve.SexticTwist == M_TYPE:
-            X = X.inverse()
-        X2 = X.copy()
-        X2.sqr()
-        # self.affine()
-        self.x = self.x.conj()
-        self.y = self.y.conj()
+        X2, X3 = PSI
+        self.x = self.x.conj() * X2
+        self.y = self.y.conj() * X3
         self.z = self.z.conj()
-        self.x *= X2
-        self.y *= X2
-        self.y *= X
+        return self
+
+# test for membership of G2, psi(P)=x.P for BLS12 and
+# psi^3(2x.P)=P+x.P+psi(x.P)+psi^2(x.P) for BN, with x signed
+    def in_subgroup(self):
+        if self.isinf():
+            return True
+        T = curve.x * self
+        if curve.SignOfX == NEGATIVEX:
+            T = -T
+        if curve.PairingFriendly == BN:
+            W = T.copy().frobenius()
+            T.add(self)
+            T.add(W)
+            W.frobenius()
+            T.add(W)
+            W.frobenius()
+            W.dbl()
+        else:
+            W = self.copy().frobenius()
+        return W == T
+
+# multiply by the cofactor, so that the result is in G2, using psi and
+# multiplications by x only. For BN (Fuentes-Castaneda, Knapp and
+# Rodriguez-Henriquez) P -> x.P+psi(3x.P)+psi^2(x.P)+psi^3(P), for BLS12
+# (Budroni and Pintore) P -> x^2.P-x.P-P+psi(x.P-P)+psi^2(2P)
+    def cfp(self):
+        T = curve.x * self
+        if curve.PairingFriendly == BN:
+            if curve.SignOfX == NEGATIVEX:
+                T = -T
+            K = T.copy()
+            K.dbl()
+            K.add(T)
+            K.frobenius()
+            self.frobenius()
+            self.frobenius()
+            self.frobenius()
+            self.add(T)
+            self.add(K)
+            T.frobenius()
+            T.frobenius()
+            self.add(T)
+        else:
+            T2 = curve.x * T
+            if curve.SignOfX == NEGATIVEX:
+                T = -T
+            T2.add(-T)
+            T2.add(-self)
+            T.add(-self)
+            T.frobenius()
+            self.dbl()
+            self.frobenius()
+            self.frobenius()
+            self.add(T2)
+            self.add(T)
         return self
 
     def __str__(self):			# pretty print
@@ -324,14 +410,16 @@ class ECp2:
                 PK[0]=0x03
         return PK
 
+# convert a list of points to arrays of bytes
+    def toBytes_all(L, compress):
+        ECp2.normalize_all(L)
+        return [P.toBytes(compress) for P in L]
+
 # calculate Right Hand Side of elliptic curve equation y^2=RHS(x)
 
 
 def RHS(x):
-    if curve.SexticTwist == D_TYPE:
-        return x * x * x + Fp2(ECp.B).divQNR()  # on the sextic twist
-    else:
-        return x * x * x + Fp2(ECp.B).mulQNR()  # on the sextic twist
+    return x * x * x + ECp2.B  # on the sextic twist
 
 # get group generator point
 
@@ -341,6 +429,322 @@ def generator():
     P.set(Fp2(Fp(curve.Pxa), Fp(curve.Pxb)), Fp2(Fp(curve.Pya), Fp(curve.Pyb)))
     return P
 
+# expand_message_xmd of RFC 9380, n bytes from msg and a domain separation
+# tag DST, using the curve hash
+
+
+def xmd(msg, DST, n):
+    h = hashlib.new(curve.SHA)
+    ell = (n + h.digest_size - 1) // h.digest_size
+    DP = DST + bytes([len(DST)])
+    b0 = hashlib.new(curve.SHA, bytes(h.block_size) + msg +
+                     n.to_bytes(2, 'big') + bytes(1) + DP).digest()
+    b = hashlib.new(curve.SHA, b0 + bytes([1]) + DP).digest()
+    U = b
+    for i in range(2, ell + 1):
+        b = bytes(s ^ t for s, t in zip(b0, b))
+        b = hashlib.new(curve.SHA, b + bytes([i]) + DP).digest()
+        U += b
+    return U[0:n]
+
+# hash msg to count elements of Fp2, with k/8 extra bytes for each Fp
+# where k is the security level, so the results are close to uniform
+
+
+def hash_to_field(msg, DST, count):
+    p = curve.p
+    L = (p.bit_length() + (curve.r.bit_length() + 1) // 2 + 7) // 8
+    U = xmd(msg, DST, 2 * L * count)
+    F = []
+    for i in range(0, 2 * count, 2):
+        a = big.from_bytes(U[i * L:(i + 1) * L])
+        b = big.from_bytes(U[(i + 1) * L:(i + 2) * L])
+        F.append(Fp2(Fp(a), Fp(b)))
+    return F
+
+
+def fp2(c):
+    return Fp2(Fp(c[0]), Fp(c[1]))
+
+# evaluate the polynomial with coefficients C at x
+
+
+def poly(C, x):
+    R = fp2(C[-1])
+    for c in reversed(C[0:-1]):
+        R = R * x + fp2(c)
+    return R
+
+# simplified SWU map of u to the curve y^2=x^3+IsoA.x+IsoB, followed by the
+# isogeny onto the twist. The result is left projective, no inversions
+
+
+def sswu(u):
+    A = fp2(curve.IsoA)
+    B = fp2(curve.IsoB)
+    Z = fp2(curve.IsoZ)
+    t = Z * u * u
+    d = t * t + t
+    if d.iszero():
+        x = B * (Z * A).inverse()
+    else:
+        x = -B * A.inverse() * (d.inverse() + Fp2(Fp(1)))
+    ok, y = ((x * x + A) * x + B).qrsqrt()
+    if not ok:
+        x = t * x
+        ok, y = ((x * x + A) * x + B).qrsqrt()
+    if y.sign() != u.sign():
+        y = -y
+    XD = poly(curve.IsoXD, x)
+    YD = poly(curve.IsoYD, x)
+    P = ECp2()
+    P.x = poly(curve.IsoXN, x) * YD
+    P.y = y * poly(curve.IsoYN, x) * XD
+    P.z = XD * YD
+    return P
+
+# Shallue-van de Woestijne map of u directly to the twist y^2=x^3+B', which
+# works for any curve. The constants of RFC 9380 are found on first use
+SVDW = None
+
+
+def svdw(u):
+    global SVDW
+    if SVDW is None:
+        c = 1
+        while SVDW is None:
+            for Z in (Fp2(Fp(c)), Fp2(Fp(-c))):
+                gZ = RHS(Z)
+                h = Z * Z * Fp2(Fp(3))
+                if gZ.iszero() or RHS(-Z.div2()).qr() != 1 and gZ.qr() != 1:
+                    continue
+                ok, c3 = (-gZ * h).qrsqrt()
+                if not ok:
+                    continue
+                if c3.sign() == 1:
+                    c3 = -c3
+                SVDW = (Z, gZ, -Z.div2(), c3, -gZ * Fp2(Fp(4)) * h.inverse())
+                break
+            c += 1
+    Z, c1, c2, c3, c4 = SVDW
+    t1 = u * u * c1
+    t2 = Fp2(Fp(1)) + t1
+    t1 = Fp2(Fp(1)) - t1
+    t3 = t1 * t2
+    if not t3.iszero():
+        t3 = t3.inverse()
+    t4 = u * t1 * t3 * c3
+    x = c2 - t4
+    ok, y = RHS(x).qrsqrt()
+    if not ok:
+        x = c2 + t4
+        ok, y = RHS(x).qrsqrt()
+    if not ok:
+        x = t2 * t2 * t3
+        x = x * x * c4 + Z
+        ok, y = RHS(x).qrsqrt()
+    if y.sign() != u.sign():
+        y = -y
+    P = ECp2()
+    P.set(x, y)
+    return P
+
+# hash a message to a point of G2, as RFC 9380 hash_to_curve: two field
+# elements are mapped to the twist, added and the cofactor cleared with cfp
+
+
+def hash_to_point(msg, DST=b"MIRACL_CORE_HASH_TO_G2_"):
+    if isinstance(msg, str):
+        msg = bytes(msg, 'utf-8')
+    U = hash_to_field(msg, DST, 2)
+    if hasattr(curve, 'IsoA'):
+        P = sswu(U[0])
+        P.add(sswu(U[1]))
+    else:
+        P = svdw(U[0])
+        P.add(svdw(U[1]))
+    return P.cfp()
+
+# decode a point of G2 from bytes, or None if it is not on the curve or
+# not in the group. Results for the last MEMBER_N encodings are kept, so
+# a public key seen again needs no decompression or membership test
+MEMBER_N = 64
+MEMBERS = {}
+
+
+def from_bytes_member(W):
+    W = bytes(W)
+    if W in MEMBERS:
+        P = MEMBERS[W]
+    else:
+        P = ECp2()
+        if not P.fromBytes(W) or not P.in_subgroup():
+            P = None
+        if len(MEMBERS) >= MEMBER_N:
+            del MEMBERS[next(iter(MEMBERS))]
+        MEMBERS[W] = P
+    if P is None:
+        return None
+    return P.copy()
+
+
+# Fixed base table for the generator, built on first use. Row i holds
+# j.2^(wi).G for j=1..2^(w-1), about (n/w).2^(w-1) points for an n-bit
+# group order. Set GTW before first use to trade memory for speed
+GTW = 4
+GTAB = None
+
+
+def gtable():
+    global GTAB
+    if GTAB is None:
+        w = GTW
+        B = generator()
+        T = []
+        for i in range(0, (curve.r.bit_length() + w) // w + 1):
+            R = B.copy()
+            for j in range(1, 1 << (w - 1)):
+                Q = R.copy()
+                Q.add(B)
+                T.append(R)
+                R = Q
+            T.append(R)
+            B = R.copy()
+            B.dbl()
+        GTAB = ECp2.normalize_all(T)
+    return GTAB
+
+# e.G from the fixed base table, signed digits, no doublings
+
+
+def generator_mul(e):
+    if native.active():
+        return e * generator()
+    w = GTW
+    T = gtable()
+    e %= curve.r
+    h = 1 << (w - 1)
+    R = ECp2()
+    i = 0
+    while e > 0:
+        t = e & ((1 << w) - 1)
+        e >>= w
+        if t > h:
+            t -= 1 << w
+            e += 1
+        if t > 0:
+            R.add(T[i + t - 1])
+        if t < 0:
+            R.add(-T[i - t - 1])
+        i += h
+    return R
+
+# Straus interleaved multiplication, sum of D.T for each (D, T, -T) in L
+
+
+def straus(L):
+    k = max(len(D) for D, _, _ in L)
+    R = ECp2()
+    for i in range(k - 1, -1, -1):
+        R.dbl()
+        for D, V, NV in L:
+            if i < len(D):
+                d = D[i]
+                if d > 0:
+                    R.add(V[d >> 1])
+                if d < 0:
+                    R.add(NV[-d >> 1])
+    return R
+
+# sum of scalars[i].points[i]. Straus interleaved wNAF for a few points,
+# Pippenger with signed digit buckets for many. Straus below MULTI_N
+MULTI_N = 32
+
+
+def multi_mul(points, scalars):
+    L = []
+    E = []
+    for P, e in zip(points, scalars):
+        if e == 0 or P.isinf():
+            continue
+        if e < 0:
+            P = -P
+            e = -e
+        L.append(P.copy())
+        E.append(e)
+    R = ECp2()
+    if len(L) == 0:
+        return R
+    if len(L) < MULTI_N:
+        T = []
+        for P, e in zip(L, E):
+            w = big.wnafw(e.bit_length())
+            V = ECp2.oddmultiples(P, w)
+            T.append((big.wnaf(e, w), V, [-Q for Q in V]))
+        return straus(T)
+    ECp2.normalize_all(L)
+    NL = [-P for P in L]
+    nb = max(e.bit_length() for e in E)
+    c = big.pippw(len(L), nb)
+    k = nb // c + 1
+    D = [big.sdigits(e, c, k) for e in E]
+    h = 1 << (c - 1)
+    for i in range(k - 1, -1, -1):
+        for j in range(0, c):
+            R.dbl()
+        B = [None] * (h + 1)
+        for n in range(0, len(L)):
+            d = D[n][i]
+            if d == 0:
+                continue
+            if B[abs(d)] is None:
+                B[abs(d)] = ECp2()
+            if d > 0:
+                B[d].add(L[n])
+            else:
+                B[-d].add(NL[n])
+        S = ECp2()
+        T = ECp2()
+        for j in range(h, 0, -1):
+            if B[j] is not None:
+                S.add(B[j])
+            T.add(S)
+        R.add(T)
+    return R
+
+# GLS decomposition of 0<=e<r into k0+k1.psi+k2.psi^2+k3.psi^3, each about
+# a quarter the length of r, by rounding against the lattice basis
+
+
+def gls(e):
+    r = curve.r
+    k = [e, 0, 0, 0]
+    for w, B in zip(curve.Glsw, curve.Gls):
+        c = (w * e + r // 2) // r
+        for i in range(0, 4):
+            k[i] -= c * B[i]
+    return k
+
+# e.P for P in G2, as the sum of ki.psi^i(P). The tables for psi^i(P) are
+# the Frobenius of the odd multiples of P, so need no further inversions
+
+
+def gls_mul(P, e):
+    K = gls(e % curve.r)
+    w = big.wnafw(max(abs(k) for k in K).bit_length())
+    V = ECp2.oddmultiples(P, w)
+    L = []
+    for k in K:
+        NV = [-Q for Q in V]
+        if k > 0:
+            L.append((big.wnaf(k, w), V, NV))
+        if k < 0:
+            L.append((big.wnaf(-k, w), NV, V))
+        V = [Q.copy().frobenius() for Q in V]
+    if len(L) == 0:
+        return ECp2()
+    return straus(L)
+
 # P=generator()
 # print(curve.r*P)
 # P.dbl()
@@ -50,26 +50,26 @@
 # M.Scott August 2013
 #
 
-import copy
 from XXX import big
 from XXX import curve
 
+# square root of -1, needed by sqrt_ratio when p=5 mod 8
+if curve.p % 8 == 5:
+    SQRTM1 = pow(2, (curve.p - 1) // 4, curve.p)
+
 
 class Fp:
+    __slots__ = ('x',)
     p = curve.p
 
     def __init__(self, x=None):
-        if (x is None or x == 0):
+        if x is None:
             self.x = 0
         else:
-            if (x < 0):
-                y = -x
-                self.x = Fp.p - (y % Fp.p)
-            else:
-                self.x = x % Fp.p
+            self.x = x % Fp.p
 
     def copy(self):
-        return copy.copy(self)
+        return Fp(self.x)
 
     def __add__(self, other):
         return Fp(big.modadd(self.x, other.x, Fp.p))
@@ -86,10 +86,12 @@ class Fp:
         return self
 
     def __mul__(self, other):
-        return Fp(big.modmul(self.x, other.x, Fp.p))
+        R = Fp.__new__(Fp)
+        R.x = big.modreduce(self.x * other.x)
+        return R
 
     def __imul__(self, other):
-        self.x = big.modmul(self.x, other.x, Fp.p)
+        self.x = big.modreduce(self.x * other.x)
         return self
 
     def __neg__(self):
@@ -101,6 +103,10 @@ class Fp:
     def inverse(self):
         return Fp(big.invmodp(self.x, Fp.p))
 
+    def batch_inverse(L):  # invert list of Fps, one inversion
+        R = big.invmodp_batch([a.x for a in L], Fp.p)
+        return [Fp(r) for r in R]
+
     def div2(self):
         if self.x % 2 == 1:
             return Fp((Fp.p + self.x) // 2)
@@ -138,9 +144,30 @@ class Fp:
     def sqrt(self):
         return Fp(big.sqrtmodp(self.x, Fp.p))
 
+# square root of u/v and a flag to say if it exists, one exponentiation
+    def sqrt_ratio(u, v):
+        p = Fp.p
+        if p % 4 == 3:
+            r = u.x * pow(u.x * v.x, (p - 3) // 4, p) % p
+        elif p % 8 == 5:
+            v3 = v.x * v.x * v.x % p
+            r = u.x * v3 * pow(u.x * v3 * v3 * v.x, (p - 5) // 8, p) % p
+            if v.x * r * r % p != u.x:
+                r = r * SQRTM1 % p
+        else:
+            w = u * v.inverse()
+            r = w.sqrt()
+            return (r * r == w, r)
+        R = Fp(r)
+        return (v * R * R == u, R)
+
+# inverse square root
+    def invsqrt(self):
+        return Fp.sqrt_ratio(Fp(1), self)
+
     def int(self):
         return self.x
 
-    def rand(self):
-        self.x = big.rand(Fp.p)
+    def rand(self, rng=None):
+        self.x = big.rand(Fp.p, rng)
         return self
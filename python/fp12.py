@@ -50,13 +50,14 @@
 # M.Scott August 2018
 #
 
-import copy
 from constants import *
 from XXX import curve
 from XXX.fp4 import *
+from XXX import fp12flat
 
 
 class Fp12:
+    __slots__ = ('a', 'b', 'c')
 
     def __init__(self, a=None, b=None, c=None):
         if b is None:
@@ -74,7 +75,7 @@ class Fp12:
             self.c = c.copy()
 
     def copy(self):
-        return copy.deepcopy(self)
+        return Fp12(self.a, self.b, self.c)
 
     def one():
         return Fp12(Fp4(Fp2(Fp(1))))
@@ -91,6 +92,18 @@ class Fp12:
         self.c = c
         return self
 
+# convert to and from the flat list of 12 integers used by fp12flat.py
+    def tolist(self):
+        a, b, c = self.a, self.b, self.c
+        return [a.a.a.x, a.a.b.x, b.a.a.x, b.a.b.x, c.a.a.x, c.a.b.x,
+                a.b.a.x, a.b.b.x, b.b.a.x, b.b.b.x, c.b.a.x, c.b.b.x]
+
+    def fromlist(self, v):
+        self.a = Fp4(Fp2(Fp(v[0]), Fp(v[1])), Fp2(Fp(v[6]), Fp(v[7])))
+        self.b = Fp4(Fp2(Fp(v[2]), Fp(v[3])), Fp2(Fp(v[8]), Fp(v[9])))
+        self.c = Fp4(Fp2(Fp(v[4]), Fp(v[5])), Fp2(Fp(v[10]), Fp(v[11])))
+        return self
+
     def __add__(self, other):
         R = Fp12(self.a + other.a, self.b + other.b, self.c + other.c)
         return R
@@ -123,90 +136,57 @@ class Fp12:
         self.c = self.c.conj()
         return self
 
-# unitary squaring
+# unitary squaring, lazy reduction - reduce once per output coefficient
     def usqr(self):
-        A = self.a.copy()
-        self.a.sqr()
-        D = self.a.copy()
-        self.a += self.a
-        self.a += D
-        A = A.conj()
-        A += A
-        self.a -= A
-        B = self.c.copy()
-        B.sqr()
-        B = B.mulQNR()
-        D = B.copy()
-        B += B
-        B += D
-        C = self.b.copy()
-        C.sqr()
-        D = C.copy()
-        C += C
-        C += D
-        self.b = self.b.conj()
-        self.b += self.b
-        self.c = self.c.conj()
-        self.c += self.c
-        self.c = -self.c
-        self.b += B
-        self.c += C
+        A = self.a.sqru()
+        B = qnru(self.c.sqru())
+        C = self.b.sqru()
+        a = self.a.ints()
+        b = self.b.ints()
+        c = self.c.ints()
+        s = (1, 1, -1, -1)		# conj
+        self.a = Fp4().setu([3 * A[k] - 2 * s[k] * a[k] for k in range(0, 4)])
+        self.b = Fp4().setu([3 * B[k] + 2 * s[k] * b[k] for k in range(0, 4)])
+        self.c = Fp4().setu([3 * C[k] - 2 * s[k] * c[k] for k in range(0, 4)])
         return self
 
 # regular squaring
     def sqr(self):  # mutable
-        if self.isone() :
-            return
-        A = self.a.copy()
-        A.sqr()
-        B = self.b * self.c
-        B += B
-        C = self.c.copy()
-        C.sqr()
-        D = self.a * self.b
-        D += D
-        self.c += (self.a + self.b)
-        self.c.sqr()
-        self.a = A + B.mulQNR()
-        self.b = D + C.mulQNR()
-        self.c -= (A + B + C + D)
+        if self.isone():
+            return self
+        A = self.a.sqru()
+        B = self.b.mulu(self.c)
+        B = addu(B, B)
+        C = self.c.sqru()
+        D = self.a.mulu(self.b)
+        D = addu(D, D)
+        E = (self.a + self.b + self.c).sqru()
+        self.c = Fp4().setu(subu(subu(E, addu(A, B)), addu(C, D)))
+        self.a = Fp4().setu(addu(A, qnru(B)))
+        self.b = Fp4().setu(addu(D, qnru(C)))
         return self
 
 # optimized to take advantage of sparse multiplier
     def __imul__(self, other):
         zero_c = other.c.iszero()
         zero_b = other.b.iszero()
-        Z0 = self.a * other.a
-        if not zero_b:
-            Z2 = self.b * other.b
-        T0 = self.a + self.b
-        T1 = other.a + other.b
-        Z1 = T0 * T1
-        Z1 -= Z0
-        if not zero_b:
-            Z1 -= Z2
-        T0 = self.b + self.c
-        T1 = other.b + other.c
-        Z3 = T0 * T1
+        Z0 = self.a.mulu(other.a)
+        Z1 = subu((self.a + self.b).mulu(other.a + other.b), Z0)
+        Z2 = subu((self.a + self.c).mulu(other.a + other.c), Z0)
+        Z3 = (self.b + self.c).mulu(other.b + other.c)
         if not zero_b:
-            Z3 -= Z2
-        T0 = self.a + self.c
-        T1 = other.a + other.c
-        T0 *= T1
-        if not zero_b:
-            Z2 += T0
-        else:
-            Z2 = T0.copy()
-        Z2 -= Z0
-        self.b = Z1.copy()
+            T0 = self.b.mulu(other.b)
+            Z1 = subu(Z1, T0)
+            Z2 = addu(Z2, T0)
+            Z3 = subu(Z3, T0)
         if not zero_c:
-            T0 = self.c * other.c
-            Z2 -= T0
-            Z3 -= T0
-            self.b += T0.mulQNR()
-        self.a = Z0 + Z3.mulQNR()
-        self.c = Z2.copy()
-
+            T0 = self.c.mulu(other.c)
+            Z1 = addu(Z1, qnru(T0))
+            Z2 = subu(Z2, T0)
+            Z3 = subu(Z3, T0)
+        self.a = Fp4().setu(addu(Z0, qnru(Z3)))
+        self.b = Fp4().setu(Z1)
+        self.c = Fp4().setu(Z2)
         return self
 
     def __mul__(self, other):
@@ -291,13 +271,13 @@ class Fp12:
             return True
         return False
 
-    def rand(self):  # mutable
+    def rand(self, rng=None):  # mutable
         r = Fp4()
-        r.rand()
+        r.rand(rng)
         self.a = r.copy()
-        r.rand()
+        r.rand(rng)
         self.b = r.copy()
-        r.rand()
+        r.rand(rng)
         self.c = r.copy()
         return self
 
@@ -318,6 +298,17 @@ class Fp12:
                 x.conj()
         return r
 
+# power in the cyclotomic subgroup using compressed squarings, for sparse e
+    def compow(self, e):
+        r = fp12flat.compow(self.tolist(), e)
+        if r is None:
+            return self.pow(e)
+        return Fp12().fromlist(r)
+
+# power to |x| for the curve parameter x
+    def cyclotomic_pow_x(self):
+        return self.compow(curve.x)
+
     def __str__(self):			# pretty print
         return "[%s,%s,%s]" % (self.a, self.b, self.c)
 
@@ -333,12 +324,18 @@ class Fp12:
         return Fp12(wa * f, wb * f, wc * f)
 
     def powq(self):
-        X = Fp2(Fp(curve.Fra), Fp(curve.Frb))
-        X2 = Fp2(Fp(curve.Fra), Fp(curve.Frb))
-        X2.sqr()
-        self.a = self.a.powq()
-        self.b = self.b.powq().muls(X)
-        self.c = self.c.powq().muls(X2)
+        return self.frobenius(1)
+
+# raise to the power q^k in one pass, k=1,2,3. Coefficients of
+# 1,w,..,w^5 are a.a,b.a,c.a,a.b,b.b,c.b
+    def frobenius(self, k):
+        C = [self.a.a, self.b.a, self.c.a, self.a.b, self.b.b, self.c.b]
+        if k % 2 == 1:
+            C = [x.conj() for x in C]
+        C = [x * f for x, f in zip(C, FROB[k])]
+        self.a = Fp4(C[0], C[3])
+        self.b = Fp4(C[1], C[4])
+        self.c = Fp4(C[2], C[5])
         return self
 
     def trace(self):
@@ -0,0 +1,446 @@
+#
+# Copyright (c) 2012-2020 MIRACL UK Ltd.
+#
+# This file is part of MIRACL Core
+# (see https://github.com/miracl/core).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as
+#    published by the Free Software Foundation, either version 3 of the
+#    License, or (at your option) any later version.
+
+
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+
+#     https://www.gnu.org/licenses/agpl-3.0.en.html
+
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+#   You can be released from the requirements of the license by purchasing     
+#   a commercial license. Buying such a license is mandatory as soon as you
+#   develop commercial activities involving the MIRACL Core Crypto SDK
+#   without disclosing the source code of your own applications, or shipping
+#   the MIRACL Core Crypto SDK with a closed source product.     
+
+#
+# Fp^12 Class - flat representation
+# An element is a list of 12 integers mod p, the Fp2 coefficients of
+# 1,w,w^2,..,w^5 where w^6=QNR. Drop-in replacement for fp12.py
+#
+
+from constants import *
+from XXX import curve
+from XXX import big
+from XXX import fp2
+
+p = curve.p
+QNRI = curve.QNRI
+
+# w^k position of each Fp2 of the Fp4 tower order a.a,a.b,b.a,b.b,c.a,c.b
+TW = [0, 3, 1, 4, 2, 5]
+
+
+def mul2(x0, x1, y0, y1):
+    return ((x0 * y0 - x1 * y1) % p, (x0 * y1 + x1 * y0) % p)
+
+# Frobenius constants FRB[j][k] for the power q^j of w^k, from fp2.FROB
+FRB = [[F.get() for F in R] for R in fp2.FROB]
+
+# fold coefficients of w^6..w^10 back down and reduce mod p
+def reduce(r):
+    for k in range(0, 10, 2):
+        u = r[k + 12]
+        v = r[k + 13]
+        r[k] += (u << QNRI) - v
+        r[k + 1] += u + (v << QNRI)
+    return [c % p for c in r[0:12]]
+
+# zeros are skipped, so sparse line functions are cheap
+def mul(x, y):
+    r = [0] * 22
+    ny = [j for j in range(0, 12, 2) if y[j] != 0 or y[j + 1] != 0]
+    for i in range(0, 12, 2):
+        a0 = x[i]
+        a1 = x[i + 1]
+        if a0 == 0 and a1 == 0:
+            continue
+        for j in ny:
+            b0 = y[j]
+            b1 = y[j + 1]
+            r[i + j] += a0 * b0 - a1 * b1
+            r[i + j + 1] += a0 * b1 + a1 * b0
+    return reduce(r)
+
+
+def sqr(x):
+    r = [0] * 22
+    for i in range(0, 12, 2):
+        a0 = x[i]
+        a1 = x[i + 1]
+        r[2 * i] += (a0 + a1) * (a0 - a1)
+        r[2 * i + 1] += 2 * a0 * a1
+        a0 += a0
+        a1 += a1
+        for j in range(i + 2, 12, 2):
+            b0 = x[j]
+            b1 = x[j + 1]
+            r[i + j] += a0 * b0 - a1 * b1
+            r[i + j + 1] += a0 * b1 + a1 * b0
+    return reduce(r)
+
+# Fp4 squaring of (u0+i.u1)+s.(v0+i.v1), unreduced
+def sqr4(u0, u1, v0, v1):
+    s0 = (v0 + v1) * (v0 - v1)
+    s1 = 2 * v0 * v1
+    A0 = (u0 + u1) * (u0 - u1) + (s0 << QNRI) - s1
+    A1 = 2 * u0 * u1 + s0 + (s1 << QNRI)
+    B0 = 2 * (u0 * v0 - u1 * v1)
+    B1 = 2 * (u0 * v1 + u1 * v0)
+    return (A0, A1, B0, B1)
+
+# Granger-Scott unitary squaring
+def usqr(x):
+    A0, A1, A2, A3 = sqr4(x[0], x[1], x[6], x[7])
+    B0, B1, B2, B3 = sqr4(x[2], x[3], x[8], x[9])
+    C0, C1, C2, C3 = sqr4(x[4], x[5], x[10], x[11])
+    r = [0] * 12
+    r[0] = 3 * A0 - 2 * x[0]
+    r[1] = 3 * A1 - 2 * x[1]
+    r[6] = 3 * A2 + 2 * x[6]
+    r[7] = 3 * A3 + 2 * x[7]
+    r[2] = 2 * x[2] + 3 * ((C2 << QNRI) - C3)
+    r[3] = 2 * x[3] + 3 * (C2 + (C3 << QNRI))
+    r[8] = 3 * C0 - 2 * x[8]
+    r[9] = 3 * C1 - 2 * x[9]
+    r[4] = 3 * B0 - 2 * x[4]
+    r[5] = 3 * B1 - 2 * x[5]
+    r[10] = 3 * B2 + 2 * x[10]
+    r[11] = 3 * B3 + 2 * x[11]
+    return [c % p for c in r]
+
+# x^(q^k) in one pass, conjugate the coefficients if k is odd and
+# multiply by the constants of q^k
+def frobenius(x, k):
+    F = FRB[k]
+    r = [x[0], x[1] if k % 2 == 0 else -x[1] % p]
+    for j in range(1, 6):
+        c0 = x[2 * j]
+        c1 = x[2 * j + 1]
+        if k % 2 == 1:
+            c1 = -c1
+        f0, f1 = F[j]
+        r.append((c0 * f0 - c1 * f1) % p)
+        r.append((c0 * f1 + c1 * f0) % p)
+    return r
+
+
+# Fp2 and Fp4 helpers on tuples, only used for inversion
+def inv2(x):
+    n = big.invmodp(x[0] * x[0] + x[1] * x[1], p)
+    return (x[0] * n % p, -x[1] * n % p)
+
+
+def add2(x, y):
+    return ((x[0] + y[0]) % p, (x[1] + y[1]) % p)
+
+
+def sub2(x, y):
+    return ((x[0] - y[0]) % p, (x[1] - y[1]) % p)
+
+
+def qnr2(x):
+    return (((x[0] << QNRI) - x[1]) % p, (x[0] + (x[1] << QNRI)) % p)
+
+
+def mul4(x, y):
+    a = mul2(x[0][0], x[0][1], y[0][0], y[0][1])
+    b = mul2(x[1][0], x[1][1], y[1][0], y[1][1])
+    c = mul2(x[0][0], x[0][1], y[1][0], y[1][1])
+    d = mul2(x[1][0], x[1][1], y[0][0], y[0][1])
+    return (add2(a, qnr2(b)), add2(c, d))
+
+
+def add4(x, y):
+    return (add2(x[0], y[0]), add2(x[1], y[1]))
+
+
+def sub4(x, y):
+    return (sub2(x[0], y[0]), sub2(x[1], y[1]))
+
+
+def qnr4(x):
+    return (qnr2(x[1]), x[0])
+
+
+def inv4(x):
+    c = inv2(sub2(mul2(x[0][0], x[0][1], x[0][0], x[0][1]),
+                  qnr2(mul2(x[1][0], x[1][1], x[1][0], x[1][1]))))
+    return (mul2(x[0][0], x[0][1], c[0], c[1]),
+            mul2(-x[1][0], -x[1][1], c[0], c[1]))
+
+
+# Karabina compressed squaring in the cyclotomic subgroup, see Aranha et al.
+# "Faster explicit formulas for computing pairings over ordinary curves".
+# Only g2,g3,g4,g5, the coefficients of w,w^4,w^2,w^5, are kept
+def compress(x):
+    return [x[2], x[3], x[8], x[9], x[4], x[5], x[10], x[11]]
+
+# Fp2 g^2+QNR.h^2, unreduced
+def sqrq(g0, g1, h0, h1):
+    s0 = (h0 + h1) * (h0 - h1)
+    s1 = 2 * h0 * h1
+    return ((g0 + g1) * (g0 - g1) + (s0 << QNRI) - s1,
+            2 * g0 * g1 + s0 + (s1 << QNRI))
+
+
+def csqr(g):
+    g2a, g2b, g3a, g3b, g4a, g4b, g5a, g5b = g
+    A0, A1 = sqrq(g4a, g4b, g5a, g5b)
+    B0, B1 = sqrq(g2a, g2b, g3a, g3b)
+    C0 = g4a * g5a - g4b * g5b
+    C1 = g4a * g5b + g4b * g5a
+    D0 = g2a * g3a - g2b * g3b
+    D1 = g2a * g3b + g2b * g3a
+    return [(2 * g2a + 6 * ((C0 << QNRI) - C1)) % p,
+            (2 * g2b + 6 * (C0 + (C1 << QNRI))) % p,
+            (3 * A0 - 2 * g3a) % p, (3 * A1 - 2 * g3b) % p,
+            (3 * B0 - 2 * g4a) % p, (3 * B1 - 2 * g4b) % p,
+            (2 * g5a + 6 * D0) % p, (2 * g5b + 6 * D1) % p]
+
+# decompress a list of compressed elements, with one inversion for all.
+# g1 is (QNR.g5^2+3g4^2-2g3)/4g2, or 2g4.g5/g3 if g2=0, and
+# g0 = QNR.(2g1^2+g2.g5-3g3.g4)+1. None if some g1 cannot be recovered
+def decompress_all(G):
+    N = []
+    D = []
+    for g in G:
+        g2, g3, g4, g5 = (g[0], g[1]), (g[2], g[3]), (g[4], g[5]), (g[6], g[7])
+        if g2 != (0, 0):
+            n = qnr2(mul2(g5[0], g5[1], g5[0], g5[1]))
+            s = mul2(g4[0], g4[1], g4[0], g4[1])
+            N.append((n[0] + 3 * s[0] - 2 * g3[0], n[1] + 3 * s[1] - 2 * g3[1]))
+            D.append((4 * g2[0], 4 * g2[1]))
+        else:
+            n = mul2(g4[0], g4[1], g5[0], g5[1])
+            N.append((2 * n[0], 2 * n[1]))
+            D.append(g3)
+        if D[-1] == (0, 0):
+            return None
+    I = big.invmodp_batch([d[0] * d[0] + d[1] * d[1] for d in D], p)
+    R = []
+    for g, n, d, i in zip(G, N, D, I):
+        g1 = mul2(n[0], n[1], d[0] * i, -d[1] * i)
+        a = mul2(g1[0], g1[1], g1[0], g1[1])
+        b = mul2(g[0], g[1], g[6], g[7])
+        c = mul2(g[2], g[3], g[4], g[5])
+        g0 = qnr2((2 * a[0] + b[0] - 3 * c[0], 2 * a[1] + b[1] - 3 * c[1]))
+        R.append([(g0[0] + 1) % p, g0[1], g[0], g[1], g[4], g[5],
+                  g1[0], g1[1], g[2], g[3], g[6], g[7]])
+    return R
+
+# conjugate, the inverse in the cyclotomic subgroup
+def conj(x):
+    return [x[0], x[1], -x[2] % p, -x[3] % p, x[4], x[5],
+            -x[6] % p, -x[7] % p, x[8], x[9], -x[10] % p, -x[11] % p]
+
+# x^e for x in the cyclotomic subgroup and e>0, squaring in compressed form
+# and decompressing only the powers x^(2^i) for the non-zero NAF digits of
+# e. Much faster than pow for sparse e, like the curve parameter x
+def compow(x, e):
+    e3 = 3 * e
+    G = []
+    S = []
+    g = compress(x)
+    r = None
+    if e3 & 2 != e & 2:
+        r = x if e3 & 2 else conj(x)
+    for i in range(2, e3.bit_length()):
+        g = csqr(g)
+        if big.bit(e3, i) != big.bit(e, i):
+            G.append(g)
+            S.append(big.bit(e3, i))
+    R = decompress_all(G)
+    if R is None:
+        return None
+    for y, s in zip(R, S):
+        if s == 0:
+            y = conj(y)
+        r = y if r is None else mul(r, y)
+    return r
+
+
+class Fp12:
+    __slots__ = ('v',)
+
+    def __init__(self, a=None, b=None, c=None):
+        self.v = [0] * 12
+        for i, f in enumerate((a, b, c)):
+            if f is None:
+                continue
+            self.v[2 * i] = f.a.a.int()
+            self.v[2 * i + 1] = f.a.b.int()
+            self.v[2 * i + 6] = f.b.a.int()
+            self.v[2 * i + 7] = f.b.b.int()
+
+    def copy(self):
+        R = Fp12()
+        R.v = self.v[:]
+        return R
+
+    def one():
+        R = Fp12()
+        R.v[0] = 1
+        return R
+
+    def zero():
+        return Fp12()
+
+    def __eq__(self, other):
+        return self.v == other.v
+
+    def __ne__(self, other):
+        return self.v != other.v
+
+    def conj(self):
+        v = self.v
+        for i in (2, 3, 6, 7, 10, 11):
+            v[i] = -v[i] % p
+        return self
+
+# unitary squaring
+    def usqr(self):
+        self.v = usqr(self.v)
+        return self
+
+# regular squaring
+    def sqr(self):
+        self.v = sqr(self.v)
+        return self
+
+    def __imul__(self, other):
+        self.v = mul(self.v, other.v)
+        return self
+
+    def __mul__(self, other):
+        R = Fp12()
+        if self == other:
+            R.v = sqr(self.v)
+        else:
+            R.v = mul(self.v, other.v)
+        return R
+
+# multiply line functions
+    def smul(self, other):
+        self.v = mul(self.v, other.v)
+        return self
+
+    def __neg__(self):
+        R = Fp12()
+        R.v = [-c % p for c in self.v]
+        return R
+
+    def iszero(self):
+        return not any(self.v)
+
+    def isone(self):
+        return self.v[0] == 1 and not any(self.v[1:])
+
+    def pow(self, other):  # unitary only
+        e = other
+        e3 = e * 3
+        k = e3.bit_length()
+        x = self.v
+        cx = self.copy().conj().v
+        r = x
+        for i in range(k - 2, 0, -1):
+            r = usqr(r)
+            if big.bit(e3, i) == 1 and big.bit(e, i) == 0:
+                r = mul(r, x)
+            if big.bit(e3, i) == 0 and big.bit(e, i) == 1:
+                r = mul(r, cx)
+        R = Fp12()
+        R.v = r
+        return R
+
+# power in the cyclotomic subgroup using compressed squarings, for sparse e
+    def compow(self, e):
+        r = compow(self.v, e)
+        if r is None:
+            return self.pow(e)
+        R = Fp12()
+        R.v = r
+        return R
+
+# power to |x| for the curve parameter x
+    def cyclotomic_pow_x(self):
+        return self.compow(curve.x)
+
+    def __str__(self):			# pretty print
+        v = self.v
+        f2 = ["[%x,%x]" % (v[2 * k], v[2 * k + 1]) for k in TW]
+        return "[[%s,%s],[%s,%s],[%s,%s]]" % tuple(f2)
+
+    def inverse(self):
+        v = self.v
+        a = ((v[0], v[1]), (v[6], v[7]))
+        b = ((v[2], v[3]), (v[8], v[9]))
+        c = ((v[4], v[5]), (v[10], v[11]))
+        wa = sub4(mul4(a, a), qnr4(mul4(b, c)))
+        wb = sub4(qnr4(mul4(c, c)), mul4(a, b))
+        wc = sub4(mul4(b, b), mul4(a, c))
+        f = inv4(add4(add4(qnr4(mul4(b, wc)), mul4(a, wa)),
+                      qnr4(mul4(c, wb))))
+        wa = mul4(wa, f)
+        wb = mul4(wb, f)
+        wc = mul4(wc, f)
+        R = Fp12()
+        R.v = [wa[0][0], wa[0][1], wb[0][0], wb[0][1], wc[0][0], wc[0][1],
+               wa[1][0], wa[1][1], wb[1][0], wb[1][1], wc[1][0], wc[1][1]]
+        return R
+
+    def powq(self):
+        return self.frobenius(1)
+
+# raise to the power q^k in one pass, k=1,2,3
+    def frobenius(self, k):
+        self.v = frobenius(self.v, k)
+        return self
+
+    def fromBytes(self, E):
+        FS = curve.EFS
+        for i in range(0, 6):
+            k = TW[i]
+            self.v[2 * k] = big.from_bytes(E[2 * i * FS:(2 * i + 1) * FS]) % p
+            self.v[2 * k + 1] = big.from_bytes(E[(2 * i + 1) * FS:(2 * i + 2) * FS]) % p
+
+    def toBytes(self):
+        FS = curve.EFS
+        E = bytearray(12 * FS)
+        for i in range(0, 6):
+            k = TW[i]
+            E[2 * i * FS:(2 * i + 1) * FS] = big.to_bytes(self.v[2 * k])
+            E[(2 * i + 1) * FS:(2 * i + 2) * FS] = big.to_bytes(self.v[2 * k + 1])
+        return E
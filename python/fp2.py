@@ -50,13 +50,14 @@
 # M.Scott August 2018
 #
 
-import copy
+from constants import *
 from XXX.fp import *
 
 # a+ib, where a,b are Fp, i is "imaginary" sqrt(-1) mod p
 
 
 class Fp2:
+    __slots__ = ('a', 'b')
 
     def __init__(self, a=None, b=None):
         if b is None:
@@ -71,7 +72,7 @@ class Fp2:
             self.b = b.copy()
 
     def copy(self):
-        return copy.deepcopy(self)
+        return Fp2(self.a, self.b)
 
     def get(self):
         return(self.a.int(), self.b.int())
@@ -106,25 +107,24 @@ class Fp2:
     def conj(self):
         return Fp2(self.a, -self.b)
 
+# lazy reduction - reduce once per output coefficient
     def sqr(self):
-        newa = (self.a + self.b) * (self.a - self.b)
-        self.b *= self.a
-        self.b += self.b
-        self.a = newa.copy()
+        a = self.a.x
+        b = self.b.x
+        self.a = Fp((a + b) * (a - b))
+        self.b = Fp(2 * a * b)
         return self
 
     def times_i(self):
         return Fp2(-self.b,self.a)
 
     def __imul__(self, other):
-        t1 = self.a * other.a
-        t2 = self.b * other.b
-        t3 = other.a + other.b
-        self.b += self.a
-        self.b *= t3
-        self.b -= t1
-        self.b -= t2
-        self.a = t1 - t2
+        a = self.a.x
+        b = self.b.x
+        t1 = a * other.a.x
+        t2 = b * other.b.x
+        self.a = Fp(t1 - t2)
+        self.b = Fp((a + b) * (other.a.x + other.b.x) - t1 - t2)
         return self
 
     def __mul__(self, other):
@@ -167,11 +167,11 @@ class Fp2:
             return True
         return False
 
-    def rand(self):
+    def rand(self, rng=None):
         r = Fp()
-        r.rand()
+        r.rand(rng)
         self.a = r.copy()
-        r.rand()
+        r.rand(rng)
         self.b = r.copy()
         return self
 
@@ -189,6 +189,17 @@ class Fp2:
         w.b *= c
         return w
 
+    def batch_inverse(L):  # invert list of Fp2s, one inversion
+        N = [a.a * a.a + a.b * a.b for a in L]
+        N = Fp.batch_inverse(N)
+        R = []
+        for i in range(0, len(L)):
+            w = L[i].conj()
+            w.a *= N[i]
+            w.b *= N[i]
+            R.append(w)
+        return R
+
     def div2(self):
         newa = self.a.div2()
         newb = self.b.div2()
@@ -218,6 +229,11 @@ class Fp2:
         return Fp.qr(w.a)
 
     def sqrt(self):
+        if Fp.p % 4 == 3:
+            ok, r = self.qrsqrt()
+            self.a = r.a
+            self.b = r.b
+            return
         w1=self.b.copy()
         w2=self.a.copy()
         w1 *= w1
@@ -237,5 +253,53 @@ class Fp2:
         w2 = w2.inverse()
         self.b *= w2 
 
-
-
+# square root and quadratic residuosity together, for p=3 mod 4, with
+# Fp.invsqrt, which also tells if its input is a QR. Returns (flag, root).
+# One Fp exponentiation for an element of Fp, else two: the root of
+# (a+s)/2 needs s, the root of the norm a^2+b^2, first
+    def qrsqrt(self):
+        a = self.a
+        b = self.b
+        if b.iszero():
+            if a.iszero():
+                return (True, Fp2())
+            ok, t = a.invsqrt()
+            if ok:
+                return (True, Fp2(a * t))
+            return (True, Fp2(Fp(0), a * t))	# (a.t)^2=-a
+        n = a * a + b * b
+        ok, t = n.invsqrt()
+        if not ok:
+            return (False, Fp2())
+        w = (a + n * t).div2()
+        ok, t = w.invsqrt()
+        if ok:		# w.t=sqrt(w), t=1/sqrt(w)
+            return (True, Fp2(w * t, (b * t).div2()))
+        # w.t=sqrt(-w), use the conjugate root (a-s)/2=-b^2/4w
+        return (True, Fp2(-(b * t).div2(), w * t))
+
+# Frobenius and twist constants, built once for the curve. With
+# X=QNR^((p-1)/6) the q^j power Frobenius takes c.w^k in Fp12 to
+# conj^j(c).FROB[j][k].w^k, for j=0..3. PSI holds the factors X^2 and X^3
+# (or their inverses for an M-type twist) that psi applies to the conjugates
+# of x and y on the twist, and TWB is the constant B' of the twist
+
+
+def frobtab():
+    X = Fp2(Fp(curve.Fra), Fp(curve.Frb))
+    XK = [Fp2(Fp(1))]
+    for k in range(1, 6):
+        XK.append(XK[k - 1] * X)
+    F = [XK[0:1] * 6]
+    for j in range(1, 4):
+        F.append([G.conj() * H for G, H in zip(F[j - 1], XK)])
+    if curve.SexticTwist == M_TYPE:
+        X = X.inverse()
+    if curve.SexticTwist == D_TYPE:
+        B = Fp2(Fp(curve.B)).divQNR()
+    else:
+        B = Fp2(Fp(curve.B)).mulQNR()
+    return (F, (X * X, X * X * X), B)
+
+
+FROB, PSI, TWB = frobtab()
@@ -50,12 +50,13 @@
 # M.Scott August 2018
 #
 
-import copy
 from XXX import curve
 from XXX.fp2 import *
 
 
 class Fp4:
+    __slots__ = ('a', 'b')
+
     def __init__(self, a=None, b=None):
         if b is None:
             if a is None:
@@ -69,7 +70,7 @@ class Fp4:
             self.b = b.copy()
 
     def copy(self):
-        return copy.deepcopy(self)
+        return Fp4(self.a, self.b)
 
     def get(self):
         return(self.a, self.b)
@@ -104,15 +105,30 @@ class Fp4:
     def conj(self):
         return Fp4(self.a, -self.b)
 
+# lazy reduction - reduce once per output coefficient
     def sqr(self):
-        newa = (self.a + self.b) * (self.a + self.b.mulQNR())
-        self.b *= self.a
-        newa -= self.b
-        newa -= self.b.mulQNR()
-        self.b += self.b
-        self.a = newa.copy()
+        return self.setu(self.sqru())
+
+# unreduced square as a list of 4 ints a.a, a.b, b.a, b.b
+    def sqru(self):
+        a0, a1 = self.a.a.x, self.a.b.x
+        b0, b1 = self.b.a.x, self.b.b.x
+        s0 = (b0 + b1) * (b0 - b1)
+        s1 = 2 * b0 * b1
+        q = curve.QNRI
+        return [(a0 + a1) * (a0 - a1) + (s0 << q) - s1,
+                2 * a0 * a1 + s0 + (s1 << q),
+                2 * (a0 * b0 - a1 * b1), 2 * (a0 * b1 + a1 * b0)]
+
+# reduce a list of 4 ints into this Fp4
+    def setu(self, u):
+        self.a = Fp2(Fp(u[0]), Fp(u[1]))
+        self.b = Fp2(Fp(u[2]), Fp(u[3]))
         return self
 
+    def ints(self):
+        return [self.a.a.x, self.a.b.x, self.b.a.x, self.b.b.x]
+
     def times_i(self):
         t = self.b.copy()
         self.b=self.a
@@ -121,15 +137,22 @@ class Fp4:
         return self
 
     def __imul__(self, other):
-        t1 = self.a * other.a
-        t2 = self.b * other.b
-        t3 = other.a + other.b
-        self.b += self.a
-        self.b *= t3
-        self.b -= t1
-        self.b -= t2
-        self.a = t1 + t2.mulQNR()
-        return self
+        return self.setu(self.mulu(other))
+
+# unreduced product as a list of 4 ints
+    def mulu(self, other):
+        a0, a1 = self.a.a.x, self.a.b.x
+        b0, b1 = self.b.a.x, self.b.b.x
+        c0, c1 = other.a.a.x, other.a.b.x
+        d0, d1 = other.b.a.x, other.b.b.x
+        t0 = a0 * c0 - a1 * c1
+        t1 = a0 * c1 + a1 * c0
+        t2 = b0 * d0 - b1 * d1
+        t3 = b0 * d1 + b1 * d0
+        q = curve.QNRI
+        return [t0 + (t2 << q) - t3, t1 + t2 + (t3 << q),
+                a0 * d0 - a1 * d1 + b0 * c0 - b1 * c1,
+                a0 * d1 + a1 * d0 + b0 * c1 + b1 * c0]
 
     def __mul__(self, other):
         R = self.copy()
@@ -161,11 +184,11 @@ class Fp4:
             return True
         return False
 
-    def rand(self):
+    def rand(self, rng=None):
         r = Fp2()
-        r.rand()
+        r.rand(rng)
         self.a = r.copy()
-        r.rand()
+        r.rand(rng)
         self.b = r.copy()
         return self
 
@@ -184,6 +207,19 @@ class Fp4:
         return w
 
     def powq(self):
-        X = Fp2(Fp(curve.Fra), Fp(curve.Frb))
-        X3 = X * X * X
-        return Fp4(self.a.conj(), self.b.conj() * X3)
+        return Fp4(self.a.conj(), self.b.conj() * FROB[1][3])
+
+# sums, differences and QNR multiples of unreduced Fp4s, lists of 4 ints
+
+
+def addu(x, y):
+    return [x[0] + y[0], x[1] + y[1], x[2] + y[2], x[3] + y[3]]
+
+
+def subu(x, y):
+    return [x[0] - y[0], x[1] - y[1], x[2] - y[2], x[3] - y[3]]
+
+
+def qnru(x):  # as mulQNR
+    q = curve.QNRI
+    return [(x[2] << q) - x[3], x[2] + (x[3] << q), x[0], x[1]]
@@ -24,6 +24,7 @@ SHA = 'sha512'   # hash type to use with this curve
 EFS = 56   # elliptic curve field size in bytes
 CurveType = EDWARDS
 CurveCof = 4
+MODTYPE = GENERALISED_MERSENNE   # form of field modulus
 
 # field modulus
 p = 2**448 - 2**224 - 1
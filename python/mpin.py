@@ -75,24 +75,23 @@ def H(mpin_id):
     return P
 
 
-def random_generate():
+def random_generate(rng=None):
     FS = curve.EFS
-    s = big.rand(curve.r)
+    s = big.rand(curve.r, rng)
     Z = big.to_bytes(s)
     return Z
 
 
 def get_server_secret(Z):
-    Q = ecp2.generator()
     s = big.from_bytes(Z)
-    Q = s * Q
+    Q = ecp2.generator_mul(s)
     return Q.toBytes(False)
 
 
 def get_client_secret(Z, ID):
     P = H(ID)
     s = big.from_bytes(Z)
-    P = s * P
+    P = pair.G1mul(P, s)
     return P.toBytes(False)
 
 
@@ -101,7 +100,7 @@ def get_client_secret(Z, ID):
 
 def extract_pin(ID, PIN, SK):
     P = H(ID)
-    P = -(PIN * P)
+    P = -pair.G1mul(P, PIN)
     S = ECp()
     if not S.fromBytes(SK):
         return bytearray(0)
@@ -113,14 +112,14 @@ def extract_pin(ID, PIN, SK):
 # U=xH(ID)
 
 
-def client_1(ID, X):
+def client_1(ID, X, rng=None):
     P = H(ID)
     if X:
         w = big.from_bytes(X)
     else:
-        w = big.rand(curve.r)
+        w = big.rand(curve.r, rng)
         X = big.to_bytes(w)
-    P = w * P
+    P = pair.G1mul(P, w)
     return (X, P.toBytes(False))
 
 
@@ -140,9 +139,9 @@ def client_2(X, Y, ID, PIN, TK):
     x = (x + y) % curve.r
     x = curve.r - x
 
-    S.add(PIN * P)
+    S.add(pair.G1mul(P, PIN))
 
-    S = x * S
+    S = pair.G1mul(S, x)
     return S.toBytes(False)
 
 
@@ -155,18 +154,18 @@ def server(ID, Y, SS, U, V):
 
     Q = ecp2.generator()
 
-    P = y * P
+    P = pair.G1mul(P, y)
 
-    sQ = ECp2()
-    if not sQ.fromBytes(SS):
+    sQ = ecp2.from_bytes_member(SS)
+    if sQ is None or sQ.isinf():
         return (False, Fp12(), Fp12())
 
     TU = ECp()
-    if not TU.fromBytes(U):
+    if not TU.fromBytes(U) or TU.isinf() or not TU.in_subgroup():
         return (False, bytearray(0), bytearray(0))
 
     TV = ECp()
-    if not TV.fromBytes(V):
+    if not TV.fromBytes(V) or TV.isinf() or not TV.in_subgroup():
         return (False, bytearray(0), bytearray(0))
 
     TU.add(P)
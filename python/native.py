@@ -0,0 +1,216 @@
+#
+# Copyright (c) 2012-2020 MIRACL UK Ltd.
+#
+# This file is part of MIRACL Core
+# (see https://github.com/miracl/core).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as
+#    published by the Free Software Foundation, either version 3 of the
+#    License, or (at your option) any later version.
+
+
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+
+#     https://www.gnu.org/licenses/agpl-3.0.en.html
+
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+#   You can be released from the requirements of the license by purchasing     
+#   a commercial license. Buying such a license is mandatory as soon as you
+#   develop commercial activities involving the MIRACL Core Crypto SDK
+#   without disclosing the source code of your own applications, or shipping
+#   the MIRACL Core Crypto SDK with a closed source product.     
+
+
+#
+# Optional native backend, binding the C library built by buildnative.py
+# through ctypes. Points and Fp12s are passed in their byte formats.
+# If the library is not found, everything stays in pure Python
+#
+
+import os
+import ctypes
+
+from XXX import curve
+
+# C names of the curve, its field and BIG type
+CNAMES = {
+    "ed25519": ("ED25519", "F25519", "256_56"),
+    "c25519": ("C25519", "F25519", "256_56"),
+    "nist256": ("NIST256", "NIST256", "256_56"),
+    "goldilocks": ("GOLDILOCKS", "GOLDILOCKS", "448_58"),
+    "nist384": ("NIST384", "NIST384", "384_56"),
+    "nist521": ("NIST521", "NIST521", "528_60"),
+    "sec256k1": ("SECP256K1", "SECP256K1", "256_56"),
+    "bn254": ("BN254", "BN254", "256_56"),
+    "bn254cx": ("BN254CX", "BN254CX", "256_56"),
+    "bls12383": ("BLS12383", "BLS12383", "384_58"),
+    "bls12381": ("BLS12381", "BLS12381", "384_58"),
+    "bn462": ("BN462", "BN462", "464_60"),
+    "x448": ("X448", "GOLDILOCKS", "448_58"),
+}
+CURVE, FIELD, BIGT = CNAMES["XXX"]
+
+# room for the largest ECP, ECP2, FP12 or BIG structure
+SIZE = 2048
+
+
+class octet(ctypes.Structure):
+    _fields_ = [("len", ctypes.c_int), ("max", ctypes.c_int),
+                ("val", ctypes.c_char_p)]
+
+# octets keep a reference to their byte buffer
+
+
+def toOctet(B):
+    buf = ctypes.create_string_buffer(bytes(B), len(B))
+    W = octet(len(B), len(B), ctypes.cast(buf, ctypes.c_char_p))
+    W.buf = buf
+    return W
+
+
+def newOctet(n):
+    buf = ctypes.create_string_buffer(n)
+    W = octet(0, n, ctypes.cast(buf, ctypes.c_char_p))
+    W.buf = buf
+    return W
+
+
+def fromOctet(W):
+    return bytearray(W.buf.raw[0:W.len])
+
+
+def load():
+    names = [os.environ.get("CORE_NATIVE_LIB"),
+             os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "libcore.so")]
+    for name in names:
+        if name is None or not os.path.isfile(name):
+            continue
+        try:
+            L = ctypes.CDLL(name)
+            L["ECP_%s_mul" % CURVE]
+            if hasattr(curve, "PairingFriendly"):
+                L["PAIR_%s_fexp" % CURVE]
+            return L
+        except (OSError, AttributeError):
+            continue
+    return None
+
+
+lib = load()
+ENABLED = True
+
+
+def active():
+    return ENABLED and lib is not None
+
+
+# C function, with ZZZ the curve, YYY the field and BBB the BIG type
+
+
+def f(name):
+    return lib[name.replace("ZZZ", CURVE).replace("YYY", FIELD).replace("BBB", BIGT)]
+
+
+def scalar(e):
+    b = ctypes.create_string_buffer(SIZE)
+    E = e.to_bytes(curve.EFS, byteorder='big')
+    f("BIG_BBB_fromBytesLen")(b, E, curve.EFS)
+    return b
+
+# scalars that fit in a BIG, otherwise stay in Python
+
+
+def fits(e):
+    return 0 < e and e.bit_length() <= 8 * curve.EFS
+
+# e.P, None if the result is the point at infinity
+
+
+def ecp_mul(W, e):
+    P = ctypes.create_string_buffer(SIZE)
+    if f("ECP_ZZZ_fromOctet")(P, ctypes.byref(toOctet(W))) == 0:
+        return None
+    f("ECP_ZZZ_mul")(P, scalar(e))
+    if f("ECP_ZZZ_isinf")(P):
+        return None
+    R = newOctet(2 * curve.EFS + 1)
+    f("ECP_ZZZ_toOctet")(ctypes.byref(R), P, False)
+    return fromOctet(R)
+
+
+def ecp2_mul(W, e):
+    P = ctypes.create_string_buffer(SIZE)
+    if f("ECP2_ZZZ_fromOctet")(P, ctypes.byref(toOctet(W))) == 0:
+        return None
+    f("ECP2_ZZZ_mul")(P, scalar(e))
+    if f("ECP2_ZZZ_isinf")(P):
+        return None
+    R = newOctet(4 * curve.EFS + 1)
+    f("ECP2_ZZZ_toOctet")(ctypes.byref(R), P, False)
+    return fromOctet(R)
+
+
+def points(*L):
+    B = []
+    for i in range(0, len(L), 2):
+        P = ctypes.create_string_buffer(SIZE)
+        f("ECP2_ZZZ_fromOctet")(P, ctypes.byref(toOctet(L[i])))
+        Q = ctypes.create_string_buffer(SIZE)
+        f("ECP_ZZZ_fromOctet")(Q, ctypes.byref(toOctet(L[i + 1])))
+        B += [P, Q]
+    return B
+
+
+def gt(r):
+    R = newOctet(12 * curve.EFS)
+    f("FP12_YYY_toOctet")(ctypes.byref(R), r)
+    return fromOctet(R)
+
+# Miller loop, P on G2 and Q on G1, as bytes
+
+
+def ate(P, Q):
+    r = ctypes.create_string_buffer(SIZE)
+    f("PAIR_ZZZ_ate")(r, *points(P, Q))
+    return gt(r)
+
+
+def double_ate(P, Q, R, S):
+    r = ctypes.create_string_buffer(SIZE)
+    f("PAIR_ZZZ_double_ate")(r, *points(P, Q, R, S))
+    return gt(r)
+
+
+def fexp(E):
+    g = ctypes.create_string_buffer(SIZE)
+    f("FP12_YYY_fromOctet")(g, ctypes.byref(toOctet(E)))
+    r = ctypes.create_string_buffer(SIZE)
+    f("FP12_YYY_one")(r)
+    f("FP12_YYY_mul")(r, g)		# also marks r as dense
+    f("PAIR_ZZZ_fexp")(r)
+    return gt(r)
@@ -24,6 +24,7 @@ SHA = 'sha256'   # hash type to use with this curve
 EFS = 32   # elliptic curve field size in bytes
 CurveType = WEIERSTRASS
 CurveCof = 1
+Coords = JACOBIAN    # point engine, PROJECTIVE or JACOBIAN (A=0 or -3)
 
 # field modulus
 p = 115792089210356248762697446949407573530086143415290314195533631308867097853951
@@ -24,6 +24,7 @@ SHA = 'sha384'   # hash type to use with this curve
 EFS = 48   # elliptic curve field size in bytes
 CurveType = WEIERSTRASS
 CurveCof = 1
+Coords = JACOBIAN    # point engine, PROJECTIVE or JACOBIAN (A=0 or -3)
 
 # field modulus
 p = 39402006196394479212279040100143613805079739270465446667948293404245721771496870329047266088258938001861606973112319
@@ -24,6 +24,8 @@ SHA = 'sha512'   # hash type to use with this curve
 EFS = 66   # elliptic curve field size in bytes
 CurveType = WEIERSTRASS
 CurveCof = 1
+MODTYPE = PSEUDO_MERSENNE   # form of field modulus
+Coords = JACOBIAN    # point engine, PROJECTIVE or JACOBIAN (A=0 or -3)
 
 # field modulus
 p = 2**521 - 1
@@ -57,9 +57,12 @@ from XXX import big
 from XXX.fp2 import *
 from XXX.fp4 import *
 from XXX.fp12 import *
+if curve.Tower == FLAT:
+    from XXX.fp12flat import Fp12
 
 from XXX import ecp
 from XXX import ecp2
+from XXX import native
 
 # line function
 
@@ -278,6 +281,26 @@ def another(r,P1,Q1) :
         lv.smul(lv2)
         r[0] *= lv
 
+# G1 multiplication e.P of a point P of order r, using GLV
+
+
+def G1mul(P, e):
+    if native.active() or not ecp.GLV:
+        return e * P
+    return ecp.glv_mul(P, e)
+
+# G2 multiplication e.P of a point P in G2, using GLS, or the fixed base
+# table for the generator
+
+
+def G2mul(P, e):
+    if native.active():
+        return e * P
+    if P == ecp2.generator():
+        return ecp2.generator_mul(e)
+    return ecp2.gls_mul(P, e)
+
+
 # full pairing - miller loop followed by final exponentiation
 
 def e(P, Q):
@@ -288,6 +311,10 @@ def e(P, Q):
 def ate(P1, Q1):
     if Q1.isinf() :
         return Fp12.one();
+    if native.active() and not P1.isinf():
+        r = Fp12()
+        r.fromBytes(native.ate(P1.toBytes(False), Q1.toBytes(False)))
+        return r
     nb,n3,n=lbits()
     
     P = P1.copy()
@@ -336,6 +363,11 @@ def double_ate(P1, Q1, U1, V1):
         return ate(U1,V1)
     if V1.isinf() :
         return ate(P1,Q1)
+    if native.active() and not P1.isinf() and not U1.isinf():
+        r = Fp12()
+        r.fromBytes(native.double_ate(P1.toBytes(False), Q1.toBytes(False),
+                                      U1.toBytes(False), V1.toBytes(False)))
+        return r
     nb,n3,n=lbits()
 
     P = P1.copy()
@@ -343,10 +375,8 @@ def double_ate(P1, Q1, U1, V1):
     U = U1.copy()
     V = V1.copy()
 
-    P.affine()
-    Q.affine()
-    U.affine()
-    V.affine()
+    ecp2.ECp2.normalize_all([P, U])
+    ecp.ECp.normalize_all([Q, V])
     A = P.copy()
     Qx, Qy = Q.getxy()
     B = U.copy()
@@ -400,14 +430,16 @@ def double_ate(P1, Q1, U1, V1):
 
 
 def fexp(r):
+    if native.active():
+        r.fromBytes(native.fexp(r.toBytes()))
+        return r
     # final exp - easy part
     t0 = r.copy()
     r.conj()
     r *= t0.inverse()
 
     t0 = r.copy()
-    r.powq()
-    r.powq()
+    r.frobenius(2)
     r *= t0
 
 # final exp - hard part
@@ -427,19 +459,19 @@ def fexp(r):
 
         x1 = res.copy()
         x1.conj()
-        x4 = res.pow(x)
+        x4 = res.cyclotomic_pow_x()
         if curve.SignOfX == POSITIVEX:
             x4.conj()
         x3 = x4.copy()
         x3.powq()
 
-        x2 = x4.pow(x)
+        x2 = x4.cyclotomic_pow_x()
         if curve.SignOfX == POSITIVEX:
             x2.conj()
 
         x5 = x2.copy()
         x5.conj()
-        t0 = x2.pow(x)
+        t0 = x2.cyclotomic_pow_x()
         if curve.SignOfX == POSITIVEX:
             t0.conj()
 
@@ -472,14 +504,12 @@ def fexp(r):
         # Ghamman & Fouotsa Method
         y0 = r.copy()
         y0.usqr()
-        y1 = y0.pow(x)
+        y1 = y0.cyclotomic_pow_x()
         if curve.SignOfX == NEGATIVEX:
             y1.conj()
-        x //= 2
-        y2 = y1.pow(x)
+        y2 = y1.compow(x // 2)
         if curve.SignOfX == NEGATIVEX:
             y2.conj()
-        x *= 2
 
         y3 = r.copy()
         y3.conj()
@@ -487,26 +517,23 @@ def fexp(r):
         y1.conj()
         y1 *= y2
 
-        y2 = y1.pow(x)
+        y2 = y1.cyclotomic_pow_x()
         if curve.SignOfX == NEGATIVEX:
             y2.conj()
-        y3 = y2.pow(x)
+        y3 = y2.cyclotomic_pow_x()
         if curve.SignOfX == NEGATIVEX:
             y3.conj()
         y1.conj()
         y3 *= y1
 
         y1.conj()
-        y1.powq()
-        y1.powq()
-        y1.powq()
+        y1.frobenius(3)
 
-        y2.powq()
-        y2.powq()
+        y2.frobenius(2)
 
         y1 *= y2
 
-        y2 = y3.pow(x)
+        y2 = y3.cyclotomic_pow_x()
         if curve.SignOfX == NEGATIVEX:
             y2.conj()
         y2 *= y0
@@ -54,8 +54,15 @@ from constants import *
 
 import ed25519.ecdh
 import ed25519.curve
+import ed25519.ecp
+import ed25519.fp
 import bn254.mpin
 import bn254.bls
+import bn254.ecp
+import bn254.ecp2
+import bn254.curve
+import bn254.fp
+import bn254.fp2
 
 # first test ECDH/ECDSA on curve ed25519
 
@@ -185,3 +192,220 @@ else:
         print("Client has invalid Token")
     else:
         print("Client PIN is out by ", err)
+
+# The shared random number generator must not hand the same bytes to
+# two threads, or two signatures could share a nonce
+
+print("\nNow test random numbers from many threads\n")
+import threading
+
+draws = []
+
+
+def draw():
+    draws.extend([ed25519.big.rand(ed25519.curve.r) for i in range(0, 5000)])
+
+
+interval = sys.getswitchinterval()
+sys.setswitchinterval(1e-6)
+threads = [threading.Thread(target=draw) for i in range(0, 8)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+sys.setswitchinterval(interval)
+if len(set(draws)) == len(draws):
+    print("SUCCESS: No repeated random numbers")
+else:
+    print("ERROR: Random numbers repeated across threads")
+
+# Batch serialisation must match toBytes point by point, for infinity and
+# for compressed and uncompressed output, and must read back
+
+print("\nNow test batch serialisation of points\n")
+for name, ecp, G in (("ed25519 G1", ed25519.ecp.ECp, ed25519.ecp.generator()),
+                     ("bn254 G1", bn254.ecp.ECp, bn254.ecp.generator()),
+                     ("bn254 G2", bn254.ecp2.ECp2, bn254.ecp2.generator())):
+    L = [ecp(), G, 2 * G, 3 * G, -G]
+    ok = True
+    for compress in (False, True):
+        B = [P.toBytes(compress) for P in L]
+        if ecp.toBytes_all([P.copy() for P in L], compress) != B:
+            ok = False
+        for P, W in zip(L[1:], B[1:]):
+            R = ecp()
+            if not R.fromBytes(W) or R != P:
+                ok = False
+    if ok:
+        print("SUCCESS: %s toBytes_all matches toBytes" % name)
+    else:
+        print("ERROR: %s toBytes_all differs from toBytes" % name)
+
+# Batch inversion leaves zero as zero, and normalisation leaves the same
+# points with z=1, and infinity alone
+
+print("\nNow test batch inversion and normalisation\n")
+Fp = bn254.fp.Fp
+Fp2 = bn254.fp2.Fp2
+ok = True
+L = [Fp(1), Fp(2), Fp(0), Fp(12345), Fp(bn254.curve.p - 1)]
+for a, b in zip(L, Fp.batch_inverse(L)):
+    if a.iszero() != b.iszero() or not a.iszero() and not (a * b).isone():
+        ok = False
+L = [Fp2(Fp(1), Fp(2)), Fp2(), Fp2(Fp(0), Fp(5)), Fp2(Fp(7))]
+for a, b in zip(L, Fp2.batch_inverse(L)):
+    if a.iszero() != b.iszero() or not a.iszero() and not (a * b).isone():
+        ok = False
+for ecp, G in ((ed25519.ecp.ECp, ed25519.ecp.generator()),
+               (bn254.ecp.ECp, bn254.ecp.generator()),
+               (bn254.ecp2.ECp2, bn254.ecp2.generator())):
+    L = [ecp(), G, 2 * G, 3 * G, ecp(), -G]
+    W = ecp.normalize_all([P.copy() for P in L])
+    for P, Q in zip(L, W):
+        if P != Q or P.isinf() != Q.isinf() or not Q.isinf() and not Q.z.isone():
+            ok = False
+if ok:
+    print("SUCCESS: Batch inversion and normalisation")
+else:
+    print("ERROR: Batch inversion or normalisation failed")
+
+# sqrt_ratio(u,v) gives a root of u/v and says if there is one, for
+# p=5 mod 8 (ed25519) and p=3 mod 4 (bn254)
+
+print("\nNow test square roots of ratios\n")
+ok = True
+for Fp in (ed25519.fp.Fp, bn254.fp.Fp):
+    v = Fp(11)
+    w = Fp(123456789)
+    n = Fp(2)
+    while n.qr() == 1:
+        n = n + Fp(1)
+    flag, r = Fp.sqrt_ratio(v * w * w, v)
+    if not flag or r * r != w * w:
+        ok = False
+    flag, r = Fp.sqrt_ratio(Fp(0), v)
+    if not flag or not r.iszero():
+        ok = False
+    flag, r = Fp.sqrt_ratio(n * v, v)
+    if flag:
+        ok = False
+    flag, r = (w * w).invsqrt()
+    if not flag or not (r * r * w * w).isone():
+        ok = False
+if ok:
+    print("SUCCESS: Square roots of ratios")
+else:
+    print("ERROR: Square root of a ratio failed")
+
+# Fixed base multiplication of the generator, including zero, negative
+# and group order multiples
+
+print("\nNow test fixed base generator multiplication\n")
+ok = True
+for name, ecp in (("ed25519 G1", ed25519.ecp), ("bn254 G1", bn254.ecp),
+                  ("bn254 G2", bn254.ecp2)):
+    G = ecp.generator()
+    r = ecp.curve.r
+    s = (r * 5) // 7
+    if ecp.generator_mul(s) != s * G or ecp.generator_mul(1) != G:
+        ok = False
+    if ecp.generator_mul(-s) != -(s * G) or ecp.generator_mul(r - 1) != -G:
+        ok = False
+    if not ecp.generator_mul(0).isinf() or not ecp.generator_mul(r).isinf():
+        ok = False
+if ok:
+    print("SUCCESS: Fixed base generator multiplication")
+else:
+    print("ERROR: Fixed base generator multiplication failed")
+
+# Multi-scalar multiplication against a sum of single multiplications,
+# with zero and negative scalars and infinity among the points, for the
+# Straus (few points) and Pippenger (many points) methods
+
+print("\nNow test multi-scalar multiplication\n")
+ok = True
+for ecp in (ed25519.ecp, bn254.ecp, bn254.ecp2):
+    G = ecp.generator()
+    r = ecp.curve.r
+    for n in (5, ecp.MULTI_N + 8):
+        P = [(i + 2) * G for i in range(0, n)]
+        E = [(r * (i + 3)) // (2 * i + 7) for i in range(0, n)]
+        P[1] = -G
+        P[2] = 0 * G
+        E[3] = 0
+        E[4] = -E[4]
+        S = 0 * G
+        for Q, e in zip(P, E):
+            S.add(e * Q)
+        if ecp.multi_mul(P, E) != S:
+            ok = False
+    if not ecp.multi_mul([G], [0]).isinf() or not ecp.multi_mul([], []).isinf():
+        ok = False
+if ok:
+    print("SUCCESS: Multi-scalar multiplication")
+else:
+    print("ERROR: Multi-scalar multiplication failed")
+
+# G1 subgroup membership. Infinity is a member. On ed25519, with cofactor
+# 8, a point of order 2 and a point from an arbitrary x are not, until
+# multiplied by the cofactor
+
+print("\nNow test G1 subgroup membership\n")
+ok = True
+for ecp in (ed25519.ecp, bn254.ecp):
+    G = ecp.generator()
+    if not G.in_subgroup() or not (5 * G).in_subgroup() or not (0 * G).in_subgroup():
+        ok = False
+P = ed25519.ecp.ECp()
+x = 2
+while not P.set(x):
+    x += 1
+if P.in_subgroup() or not (ed25519.curve.CurveCof * P).in_subgroup():
+    ok = False
+P = ed25519.ecp.ECp()
+if not P.setxy(0, ed25519.curve.p - 1) or P.in_subgroup():
+    ok = False
+if ok:
+    print("SUCCESS: G1 subgroup membership")
+else:
+    print("ERROR: G1 subgroup membership failed")
+
+# G2 membership and decoding of members only. Infinity is a member but
+# from_bytes_member rejects it, with non-members and points not on the
+# twist
+
+print("\nNow test G2 subgroup membership\n")
+ok = True
+Fp = bn254.fp.Fp
+G = bn254.ecp2.generator()
+if not G.in_subgroup() or not (5 * G).in_subgroup() or not (0 * G).in_subgroup():
+    ok = False
+P = bn254.ecp2.ECp2()
+Q = bn254.ecp2.ECp2()
+i = 1
+while not P.setx(Fp2(Fp(i)), 0):
+    i += 1
+Q.setx(Fp2(Fp(i)), 0)
+Q.cfp()
+if P.in_subgroup() or not Q.in_subgroup():
+    ok = False
+i += 1
+while Q.setx(Fp2(Fp(i)), 0):
+    i += 1
+Q = bn254.ecp2.ECp2()		# x not on the twist
+Q.x = Fp2(Fp(i))
+Q.y = Fp2(Fp(1))
+Q.z = Fp2(Fp(1))
+for V in (P.toBytes(True), bn254.ecp2.ECp2().toBytes(True), Q.toBytes(True)):
+    if bn254.ecp2.from_bytes_member(V) is not None:
+        ok = False
+for i in range(0, 2):
+    R = bn254.ecp2.from_bytes_member((3 * G).toBytes(True))
+    if R is None or R != 3 * G:
+        ok = False
+    else:
+        R.dbl()
+if ok:
+    print("SUCCESS: G2 subgroup membership")
+else:
+    print("ERROR: G2 subgroup membership failed")
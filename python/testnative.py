@@ -0,0 +1,158 @@
+#
+# Copyright (c) 2012-2020 MIRACL UK Ltd.
+#
+# This file is part of MIRACL Core
+# (see https://github.com/miracl/core).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU Affero General Public License as
+#    published by the Free Software Foundation, either version 3 of the
+#    License, or (at your option) any later version.
+
+
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+
+#     https://www.gnu.org/licenses/agpl-3.0.en.html
+
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+#   You can be released from the requirements of the license by purchasing     
+#   a commercial license. Buying such a license is mandatory as soon as you
+#   develop commercial activities involving the MIRACL Core Crypto SDK
+#   without disclosing the source code of your own applications, or shipping
+#   the MIRACL Core Crypto SDK with a closed source product.     
+
+
+#
+# Parity tests and throughput comparison of the native backend
+# against pure Python. Run config.py (any curves), then buildnative.py,
+# then python3 testnative.py
+#
+
+import time
+import importlib
+from constants import *
+
+CURVES = ["ed25519", "c25519", "nist256", "goldilocks", "nist384", "nist521",
+          "sec256k1", "x448", "bn254", "bn254cx", "bls12383", "bls12381",
+          "bn462"]
+
+MIN_TIME = 1.0
+MIN_ITERS = 5
+
+
+def timing(label, f):
+    iterations = 0
+    start = time.process_time()
+    while True:
+        f()
+        iterations += 1
+        elapsed = time.process_time() - start
+        if elapsed >= MIN_TIME and iterations >= MIN_ITERS:
+            break
+    elapsed = 1000.0 * elapsed / iterations
+    print("%-24s- %8d iterations  %8.2f ms per iteration" %
+          (label, iterations, elapsed))
+
+# run f in pure Python and natively, results as bytes
+
+
+def both(native, f):
+    native.ENABLED = False
+    a = f()
+    native.ENABLED = True
+    b = f()
+    return a == b
+
+
+def parity(name, pkg):
+    curve = pkg.curve
+    native = pkg.native
+    rng = pkg.big.RNG(b'testnative')
+    G = pkg.ecp.generator()
+    fails = 0
+    S = rng.rand_scalars(10, curve.r) + [1, 2, curve.r - 1]
+    if not both(native, lambda: pkg.ecp.ECp.toBytes_all([s * G for s in S], False)):
+        fails += 1
+    if curve.CurveType == WEIERSTRASS and hasattr(curve, "PairingFriendly"):
+        Q = pkg.ecp2.generator()
+        S = rng.rand_scalars(3, curve.r)
+        if not both(native, lambda: pkg.ecp2.ECp2.toBytes_all([s * Q for s in S], False)):
+            fails += 1
+        for s in S:
+            if not both(native, lambda: pkg.pair.e(s * Q, G).toBytes()):
+                fails += 1
+        pkg.bls.init()
+        SK, PK = pkg.bls.KeyPairGenerate(rng)
+        if not both(native, lambda: pkg.bls.sign("test message", SK)):
+            fails += 1
+        SIG = pkg.bls.sign("test message", SK)
+        if not both(native, lambda: pkg.bls.verify(SIG, "test message", PK)):
+            fails += 1
+        if not both(native, lambda: pkg.bls.verify(SIG, "test massage", PK)):
+            fails += 1
+    if fails == 0:
+        print("%s native and Python agree" % name)
+    else:
+        print("FAILURE - %s %d native and Python results differ" % (name, fails))
+
+
+def throughput(name, pkg):
+    curve = pkg.curve
+    native = pkg.native
+    G = pkg.ecp.generator()
+    s = (curve.r * 5) // 7
+    for engine in (False, True):
+        native.ENABLED = engine
+        mode = "native" if engine else "python"
+        print("\nTiming %s (%s)" % (name, mode))
+        timing("EC  mul", lambda: s * G)
+        if curve.CurveType == WEIERSTRASS and hasattr(curve, "PairingFriendly"):
+            Q = pkg.ecp2.generator()
+            SK, PK = pkg.bls.KeyPairGenerate()
+            SIG = pkg.bls.sign("test message", SK)
+            timing("G2  mul", lambda: s * Q)
+            timing("PAIRing ATE+FEXP", lambda: pkg.pair.e(Q, G))
+            timing("BLS sign", lambda: pkg.bls.sign("test message", SK))
+            timing("BLS verify", lambda: pkg.bls.verify(SIG, "test message", PK))
+    native.ENABLED = True
+
+
+for name in CURVES:
+    try:
+        pkg = importlib.import_module(name)
+        for m in ("curve", "big", "native", "ecp", "ecp2", "pair", "bls"):
+            try:
+                importlib.import_module(name + "." + m)
+            except ImportError:
+                pass
+    except ImportError:
+        continue
+    if not pkg.native.active():
+        print("%s no native library, build it with buildnative.py" % name)
+        continue
+    parity(name, pkg)
+    throughput(name, pkg)
@@ -0,0 +1,38 @@
+#
+# Copyright (c) 2012-2020 MIRACL UK Ltd.
+#
+# This file is part of MIRACL Core
+# (see https://github.com/miracl/core).
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from constants import *
+
+SHA = 'sha512'   # hash type to use with this curve
+EFS = 56   # elliptic curve field size in bytes
+CurveType = MONTGOMERY
+CurveCof = 4
+MODTYPE = GENERALISED_MERSENNE   # form of field modulus
+
+# field modulus
+p = 2**448 - 2**224 - 1
+r = 2**446 - 0x8335dc163bb124b65129c96fde933d8d723a70aadc873d6d54a7bb0d
+
+# elliptic curve
+A = 156326
+B = 0
+
+# generator point
+Gx = 5
+Gy = 0